@@ -0,0 +1,130 @@
+"""Run the benchmark suite and compare the results to the stored baseline
+
+Run with `uv run python benchmarks/runner.py`, add `--save` to store the results as the new baseline.
+Exits with 1 when a benchmark is slower than its baseline by more than the threshold.
+Baselines only make sense on the machine they were recorded on, record one before changing the code and compare after.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+from pathlib import Path
+from typing import Callable
+
+from suite import BENCHMARKS
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def measure(
+    func: Callable[[int], float], min_time: float, repeat: int
+) -> tuple[float, float]:
+    """
+    :param func: Benchmark to run
+    :param min_time: Minimum duration in seconds of one run, the number of loops is raised until it is reached
+    :param repeat: Number of runs
+    :return: Best and median time in seconds per loop
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        loops = 1
+        while True:
+            elapsed = func(loops)
+            if elapsed >= min_time:
+                break
+            # aim a bit above min_time, at most 10 times more loops at once
+            loops *= min(10, max(2, int(min_time * 1.2 / max(elapsed, 1e-9))))
+
+        timings = [elapsed / loops]
+        for _ in range(repeat - 1):
+            timings.append(func(loops) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return min(timings), statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="only run benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="slowdown ratio reported as a regression",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum duration in seconds of one run",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=7, help="number of runs per benchmark"
+    )
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    reference = baseline.get("results", {})
+    if baseline and baseline.get("python") != platform.python_version():
+        print(
+            f"warning: baseline recorded with Python {baseline.get('python')}, running {platform.python_version()}"
+        )
+
+    results = {}
+    regressions = []
+    print(
+        f"{'benchmark':<32} {'best':>10} {'median':>10} {'baseline':>10} {'ratio':>7}"
+    )
+    for name, func in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+
+        best, median = measure(func, args.min_time, args.repeat)
+        results[name] = best
+
+        line = f"{name:<32} {best * 1e6:8.1f}us {median * 1e6:8.1f}us"
+        if name in reference:
+            ratio = best / reference[name]
+            line += f" {reference[name] * 1e6:8.1f}us {ratio:6.2f}x"
+            if ratio > args.threshold:
+                regressions.append(name)
+                line += " slower"
+        print(line, flush=True)
+
+    if args.save:
+        BASELINE.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": {**reference, **results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline saved to {BASELINE}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Benchmarks of the hot paths, run them with `benchmarks/runner.py`
+
+A benchmark takes a number of loops and returns the time in seconds taken to run them, so setup is kept out of the measure.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable
+
+from httpx import AsyncClient, MockTransport, Request, Response
+from pydantic_extra_types.color import Color
+
+from awtrix_light_client.http_client import AwtrixLightHttpClient
+from awtrix_light_client.json_codec import (
+    JsonCodec,
+    OrjsonJsonCodec,
+    PydanticJsonCodec,
+    StdlibJsonCodec,
+    orjson,
+)
+from awtrix_light_client.models.application import (
+    ApplicationTemplate,
+    CustomApplication,
+    Db,
+    Df,
+    Dp,
+    Fragment,
+    Notification,
+)
+from awtrix_light_client.models.draw import DrawList
+from awtrix_light_client.models.screen import PackedScreen, Screen
+from awtrix_light_client.models.setting import Settings
+from awtrix_light_client.models.stat import Stats
+
+BENCHMARKS: dict[str, Callable[[int], float]] = {}
+
+
+def benchmark(func: Callable[[int], float]) -> Callable[[int], float]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _loop(loops: int, func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+APPLICATION = {
+    "text": [Fragment(t="21", c=Color("red")), Fragment(t="°C", c=0x00FF00)],
+    "icon": "2056",
+    "color": Color("#FF00FF"),
+    "gradient": [Color("red"), Color("blue")],
+    "progress": 42,
+    "progressC": Color("green"),
+    "draw": [Dp(x=x, y=7, cl=Color("orange")) for x in range(20)]
+    + [Df(x=0, y=0, w=4, h=4, cl=0x102030)],
+    "bar": list(range(11)),
+    "lifetime": 60,
+}
+NOTIFICATION = {
+    "text": "Door open",
+    "color": Color("red"),
+    "icon": "4300",
+    "sound": "alarm",
+    "hold": True,
+    "wakeup": True,
+}
+SETTINGS = json.dumps(
+    {
+        "MATP": True,
+        "ABRI": False,
+        "BRI": 120,
+        "ATRANS": True,
+        "TCOL": 16777215,
+        "TEFF": 1,
+        "TSPEED": 400,
+        "ATIME": 7,
+        "TMODE": 1,
+        "CHCOL": 16711680,
+        "CTCOL": 0,
+        "CBCOL": 16777215,
+        "TFORMAT": "%H %M",
+        "DFORMAT": "%d.%m.%y",
+        "SOM": True,
+        "CEL": True,
+        "BLOCKN": False,
+        "MAT": 0,
+        "SOUND": True,
+        "GAMMA": 1.9,
+        "UPPERCASE": True,
+        "CCORRECTION": "#000000",
+        "CTEMP": "#000000",
+        "WD": True,
+        "WDCA": 16777215,
+        "WDCI": 6710886,
+        "TIME_COL": 0,
+        "SSPEED": 100,
+        "TIM": True,
+        "DAT": False,
+        "HUM": True,
+        "TEMP": True,
+        "BAT": True,
+    }
+).encode()
+STATS = json.dumps(
+    {
+        "bat": 52,
+        "bat_raw": 574,
+        "type": 0,
+        "lux": 0,
+        "ldr_raw": 79,
+        "ram": 144524,
+        "bri": 120,
+        "temp": 26,
+        "hum": 45,
+        "uptime": 461,
+        "wifi_signal": -53,
+        "messages": 0,
+        "version": "0.90",
+        "indicator1": False,
+        "indicator2": False,
+        "indicator3": False,
+        "app": "Time",
+        "uid": "awtrix_fa9b04",
+        "matrix": True,
+    }
+).encode()
+SCREEN = json.dumps([(i * 0x010203) & 0xFFFFFF for i in range(256)]).encode()
+PIXELS = [(i % 32, i // 32, (i * 0x010203) & 0xFFFFFF) for i in range(256)]
+RGB888 = os.urandom(32 * 8 * 3)
+
+
+def _draw_list() -> DrawList:
+    draw = DrawList()
+    for x, y, cl in PIXELS:
+        draw.pixel(x, y, cl)
+    return draw
+
+
+@benchmark
+def custom_application_validation(loops: int) -> float:
+    return _loop(loops, lambda: CustomApplication(**APPLICATION))
+
+
+@benchmark
+def notification_validation(loops: int) -> float:
+    return _loop(loops, lambda: Notification(**NOTIFICATION))
+
+
+@benchmark
+def custom_application_dump(loops: int) -> float:
+    application = CustomApplication(**APPLICATION)
+    return _loop(loops, lambda: application.model_dump(exclude_none=True))
+
+
+@benchmark
+def custom_application_dump_json(loops: int) -> float:
+    application = CustomApplication(**APPLICATION)
+    return _loop(loops, lambda: application.model_dump_json(exclude_none=True))
+
+
+@benchmark
+def notification_build_dump_json(loops: int) -> float:
+    # what a template render replaces
+    return _loop(
+        loops,
+        lambda: Notification(
+            **NOTIFICATION, progress=42, progressC=0x00FF00
+        ).model_dump_json(exclude_none=True),
+    )
+
+
+@benchmark
+def notification_template_render(loops: int) -> float:
+    template = ApplicationTemplate(
+        Notification(**NOTIFICATION), fields=["text", "progress", "progressC"]
+    )
+    return _loop(
+        loops,
+        lambda: template.render(text="Door open", progress=42, progressC=0x00FF00),
+    )
+
+
+@benchmark
+def draw_list_dump(loops: int) -> float:
+    application = CustomApplication(draw=_draw_list())
+    return _loop(loops, lambda: application.model_dump_json(exclude_none=True))
+
+
+@benchmark
+def draw_models_build_dump(loops: int) -> float:
+    return _loop(
+        loops,
+        lambda: CustomApplication(
+            draw=[Dp(x=x, y=y, cl=cl) for x, y, cl in PIXELS]
+        ).model_dump_json(exclude_none=True),
+    )
+
+
+@benchmark
+def draw_list_build_dump(loops: int) -> float:
+    return _loop(
+        loops,
+        lambda: CustomApplication(draw=_draw_list()).model_dump_json(exclude_none=True),
+    )
+
+
+@benchmark
+def bitmap_strings_dump(loops: int) -> float:
+    def build() -> dict:
+        bmp = [
+            f"0x{RGB888[i] << 16 | RGB888[i + 1] << 8 | RGB888[i + 2]:06X}"
+            for i in range(0, len(RGB888), 3)
+        ]
+        return Db(x=0, y=0, w=32, h=8, bmp=bmp).model_dump()
+
+    return _loop(loops, build)
+
+
+@benchmark
+def bitmap_buffer_dump(loops: int) -> float:
+    return _loop(loops, lambda: Db(x=0, y=0, w=32, h=8, bmp=RGB888).model_dump())
+
+
+@benchmark
+def settings_round_trip(loops: int) -> float:
+    return _loop(
+        loops,
+        lambda: Settings.model_validate_json(SETTINGS).model_dump(exclude_none=True),
+    )
+
+
+@benchmark
+def stats_parse(loops: int) -> float:
+    return _loop(loops, lambda: Stats.model_validate_json(STATS))
+
+
+@benchmark
+def stats_parse_two_passes(loops: int) -> float:
+    return _loop(loops, lambda: Stats(**json.loads(STATS)))
+
+
+@benchmark
+def screen_parse_two_passes(loops: int) -> float:
+    return _loop(loops, lambda: Screen(matrix=json.loads(SCREEN)))
+
+
+@benchmark
+def screen_parse(loops: int) -> float:
+    return _loop(
+        loops, lambda: Screen.model_validate_json(b'{"matrix":' + SCREEN + b"}")
+    )
+
+
+@benchmark
+def packed_screen_parse(loops: int) -> float:
+    return _loop(loops, lambda: PackedScreen.from_json(SCREEN))
+
+
+def _register_codec(name: str, codec: JsonCodec) -> None:
+    payload = CustomApplication(draw=_draw_list(), bar=list(range(16))).model_dump(
+        exclude_none=True
+    )
+
+    def dumps(loops: int) -> float:
+        return _loop(loops, lambda: codec.dumps(payload))
+
+    def loads(loops: int) -> float:
+        return _loop(loops, lambda: codec.loads(SCREEN))
+
+    BENCHMARKS[f"{name}_codec_dumps"] = dumps
+    BENCHMARKS[f"{name}_codec_loads"] = loads
+
+
+_register_codec("stdlib", StdlibJsonCodec())
+_register_codec("pydantic", PydanticJsonCodec())
+if orjson is not None:
+    _register_codec("orjson", OrjsonJsonCodec())
+
+
+def _handler(request: Request) -> Response:
+    if request.url.path.endswith("/stats"):
+        return Response(200, content=STATS)
+    return Response(200, text="OK")
+
+
+def _client_loop(
+    loops: int, call: Callable[[AwtrixLightHttpClient], Awaitable[object]]
+) -> float:
+    async def main() -> float:
+        async with AsyncClient(
+            base_url="http://awtrix/api", transport=MockTransport(_handler)
+        ) as http_client:
+            client = AwtrixLightHttpClient(http_client)
+            start = time.perf_counter()
+            for _ in range(loops):
+                await call(client)
+            return time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+@benchmark
+def client_get_stats(loops: int) -> float:
+    return _client_loop(loops, lambda client: client.get_stats())
+
+
+@benchmark
+def client_set_custom_application(loops: int) -> float:
+    application = CustomApplication(**APPLICATION)
+    return _client_loop(
+        loops, lambda client: client.set_custom_application("bench", application)
+    )
+
+
+@benchmark
+def client_notify(loops: int) -> float:
+    notification = Notification(**NOTIFICATION)
+    return _client_loop(loops, lambda client: client.notify(notification))
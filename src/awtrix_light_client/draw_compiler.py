@@ -0,0 +1,123 @@
+import json
+from typing import Any, Iterable
+
+from pydantic import BaseModel
+
+from .models.application import Db, Df, Dp
+from .models.screen import SCREEN_HEIGHT, SCREEN_SIZE, SCREEN_WIDTH, PackedScreen
+
+
+def instruction_cost(instruction: BaseModel | dict[str, Any]) -> int:
+    """Helper function to compute the serialized size of a drawing instruction
+
+    :param instruction: Drawing instruction, as a model or as its serialized dict
+    :return: Number of bytes taken by the instruction in the `draw` array, separator included
+    """
+    if isinstance(instruction, BaseModel):
+        instruction = instruction.model_dump()
+    return len(json.dumps(instruction, separators=(",", ":"))) + 1
+
+
+def _grow(
+    frame: list[int], color: int, x: int, y: int, horizontal_first: bool
+) -> tuple[int, int]:
+    def same(px: int, py: int) -> bool:
+        return frame[py * SCREEN_WIDTH + px] == color
+
+    if horizontal_first:
+        w = 1
+        while x + w < SCREEN_WIDTH and same(x + w, y):
+            w += 1
+        h = 1
+        while y + h < SCREEN_HEIGHT and all(same(x + i, y + h) for i in range(w)):
+            h += 1
+    else:
+        h = 1
+        while y + h < SCREEN_HEIGHT and same(x, y + h):
+            h += 1
+        w = 1
+        while x + w < SCREEN_WIDTH and all(same(x + w, y + j) for j in range(h)):
+            w += 1
+    return w, h
+
+
+def _shape(x: int, y: int, w: int, h: int, color: int) -> Dp | Df:
+    # keep the color packed, the `PackedColor` serializer writes its hex form
+    if w == 1 and h == 1:
+        return Dp(x=x, y=y, cl=color)
+    # a run is also a rectangle, and its shorter keys make it smaller than the same `Dl`
+    return Df(x=x, y=y, w=w, h=h, cl=color)
+
+
+def _bitmap(frame: list[int], x: int, y: int, w: int, h: int) -> dict[str, Any]:
+    return {
+        "x": x,
+        "y": y,
+        "w": w,
+        "h": h,
+        "bmp": [
+            frame[row * SCREEN_WIDTH + column]
+            for row in range(y, y + h)
+            for column in range(x, x + w)
+        ],
+    }
+
+
+def compile_frame(
+    frame: PackedScreen | Iterable[int], background: int | None = 0
+) -> list[Dp | Df | Db]:
+    """Compile a 32x8 frame into a short list of drawing instructions
+
+    Pixels of the same color are greedily covered by the largest filled rectangles (`Df`) and single pixels (`Dp`), one pixel wide
+    runs included as a `Df` serializes smaller than the same line (`Dl`). The whole list is then replaced by a single bitmap (`Db`)
+    of the drawn area if that serializes smaller.
+    The result is meant to be drawn over a matrix filled with `background`.
+
+    :param frame: 256 colors in 0xRRGGBB format, row by row
+    :param background: Color not drawn, None to draw every pixel
+    :return: List of drawing instructions for `BaseApplication.draw`
+    """
+    frame = list(frame)
+    if len(frame) != SCREEN_SIZE:
+        raise ValueError(f"frame must have {SCREEN_SIZE} pixels")
+
+    covered = bytearray(SCREEN_SIZE)
+    shapes = []
+    left, top, right, bottom = SCREEN_WIDTH, SCREEN_HEIGHT, -1, -1
+
+    for index, color in enumerate(frame):
+        if color == background:
+            continue
+
+        x, y = index % SCREEN_WIDTH, index // SCREEN_WIDTH
+        left, top = min(left, x), min(top, y)
+        right, bottom = max(right, x), max(bottom, y)
+        if covered[index]:
+            continue
+
+        best, best_new = (1, 1), 0
+        for horizontal_first in (True, False):
+            w, h = _grow(frame, color, x, y, horizontal_first)
+            new = sum(
+                not covered[(y + j) * SCREEN_WIDTH + x + i]
+                for j in range(h)
+                for i in range(w)
+            )
+            if new > best_new:
+                best, best_new = (w, h), new
+
+        # a shape adding a single pixel is never cheaper than the pixel itself
+        w, h = best if best_new > 1 else (1, 1)
+        for j in range(h):
+            start = (y + j) * SCREEN_WIDTH + x
+            covered[start : start + w] = b"\x01" * w
+        shapes.append(_shape(x, y, w, h, color))
+
+    if not shapes:
+        return []
+
+    bitmap = _bitmap(frame, left, top, right - left + 1, bottom - top + 1)
+    if instruction_cost(bitmap) < sum(instruction_cost(shape) for shape in shapes):
+        return [Db(**bitmap)]
+
+    return shapes
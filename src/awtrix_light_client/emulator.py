@@ -0,0 +1,457 @@
+import asyncio
+import contextlib
+import json
+import random
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .models.effect import EffectType
+from .models.transition import TransitionType
+
+NATIVE_APPS = ("Time", "Date", "Temperature", "Humidity", "Battery")
+"""Applications built in the firmware, always first in the loop"""
+
+DEFAULT_SETTINGS = {
+    "MATP": True,
+    "ABRI": False,
+    "BRI": 120,
+    "ATRANS": True,
+    "TCOL": 16777215,
+    "TEFF": 1,
+    "TSPEED": 400,
+    "ATIME": 7,
+    "TMODE": 1,
+    "CHCOL": 16711680,
+    "CTCOL": 0,
+    "CBCOL": 16777215,
+    "TFORMAT": "%H %M",
+    "DFORMAT": "%d.%m.%y",
+    "SOM": True,
+    "CEL": True,
+    "BLOCKN": False,
+    "MAT": 0,
+    "SOUND": True,
+    "GAMMA": 1.9,
+    "UPPERCASE": True,
+    "CCORRECTION": "#000000",
+    "CTEMP": "#000000",
+    "WD": True,
+    "WDCA": 16777215,
+    "WDCI": 6710886,
+    "TIME_COL": 0,
+    "DATE_COL": 0,
+    "HUM_COL": 0,
+    "TEMP_COL": 0,
+    "BAT_COL": 0,
+    "SSPEED": 100,
+    "TIM": True,
+    "DAT": True,
+    "HUM": True,
+    "TEMP": True,
+    "BAT": True,
+}
+"""Settings of a freshly erased device"""
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class _Drop(Exception):
+    """Close the connection without answering"""
+
+
+class AwtrixEmulator:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        max_connections: int = 8,
+        ram: int = 150_000,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """
+        In-process stand-in of an Awtrix device serving the `/api` endpoints over real HTTP/1.1 connections, for integration tests and benchmarks.
+        It keeps the state a device would (applications and loop, indicators, moodlight, settings, notifications), the matrix content is
+        not rendered, set `screen` to choose what the screen endpoint returns.
+        :param host: Address to listen on
+        :param port: Port to listen on, a free port is picked if 0
+        :param latency: Delay in seconds before answering each request
+        :param jitter: Extra random delay in seconds, up to this value, added to `latency`
+        :param max_connections: Connections accepted at the same time, like the ESP32 the extra ones are closed right away
+        :param ram: Free memory in bytes at boot, custom applications use the size of their payload and are refused when it runs out
+        :param failure_rate: Share of requests answered with a 500 error, between 0 and 1
+        :param seed: Seed of the jitter and failures random generator
+        """
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1")
+        if max_connections < 1:
+            raise ValueError("max_connections must be greater than 0")
+
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.max_connections = max_connections
+        self.ram = ram
+        self.failure_rate = failure_rate
+        self.requests: list[tuple[str, str]] = []
+        """Method and endpoint of every request answered or failed on purpose"""
+
+        self._random = random.Random(seed)
+        self._failures: list[int | None] = []
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._reset(settings=True)
+
+    def _reset(self, settings: bool) -> None:
+        self.apps: dict[str, Any] = {}
+        self.current_app = NATIVE_APPS[0]
+        self.indicators: dict[int, dict[str, Any] | None] = {1: None, 2: None, 3: None}
+        self.moodlight: dict[str, Any] | None = None
+        self.notifications: list[dict[str, Any]] = []
+        self.messages = 0
+        self.power = True
+        self.screen = [0] * 256
+        self._app_sizes: dict[str, int] = {}
+        self._booted_at = time.monotonic()
+        if settings:
+            self.settings = dict(DEFAULT_SETTINGS)
+
+    @property
+    def base_url(self) -> str:
+        """
+        :return: URL to give as `base_url` to the client, available once started
+        """
+        return f"http://{self.host}:{self.port}/"
+
+    @property
+    def free_ram(self) -> int:
+        """
+        :return: Free memory in bytes
+        """
+        return self.ram - sum(self._app_sizes.values())
+
+    @property
+    def connections(self) -> int:
+        """
+        :return: Number of open connections
+        """
+        return len(self._writers)
+
+    @property
+    def loop(self) -> list[str]:
+        """
+        :return: Applications in the loop, in display order
+        """
+        return [*NATIVE_APPS, *self.apps]
+
+    def fail_next(self, status: int | None = 500, count: int = 1) -> None:
+        """
+        Make the next requests fail
+        :param status: HTTP status to answer, None to close the connection without answering
+        :param count: Number of requests to fail
+        """
+        self._failures.extend([status] * count)
+
+    async def start(self) -> None:
+        """
+        Start listening, `port` is updated with the port picked when 0 was given
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Close the open connections and stop listening
+        """
+        if self._server is None:
+            return
+
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "AwtrixEmulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        if len(self._writers) >= self.max_connections:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+            return
+
+        self._writers.add(writer)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                try:
+                    status, content = await self._answer(method, target, body)
+                except _Drop:
+                    break
+
+                content_type = (
+                    "application/json"
+                    if content.startswith((b"[", b"{"))
+                    else "text/plain"
+                )
+                head = (
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n"
+                )
+                writer.write(head.encode() + content)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, dict[str, str], bytes] | None:
+        line = await reader.readline()
+        if not line:
+            return None
+
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    async def _answer(self, method: str, target: str, body: bytes) -> tuple[int, bytes]:
+        delay = self.latency + (
+            self._random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        url = urlsplit(target)
+        endpoint = url.path.removeprefix("/api/")
+        self.requests.append((method, endpoint))
+
+        if self._failures:
+            status = self._failures.pop(0)
+            if status is None:
+                raise _Drop
+            return status, b"Injected failure"
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return 500, b"Injected failure"
+
+        if not url.path.startswith("/api/"):
+            return 404, b"Not found"
+
+        handler = getattr(self, f"_{method.lower()}_{endpoint.replace('/', '_')}", None)
+        if handler is None:
+            return 404, b"Not found"
+
+        if method == "GET":
+            return 200, json.dumps(handler()).encode()
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return 400, b"Invalid JSON"
+
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return handler(data, query)
+
+    def _get_stats(self) -> dict[str, Any]:
+        return {
+            "bat": 100,
+            "bat_raw": 670,
+            "type": 0,
+            "lux": 0,
+            "ldr_raw": 0,
+            "ram": self.free_ram,
+            "bri": self.settings["BRI"],
+            "temp": 21,
+            "hum": 40,
+            "uptime": int(time.monotonic() - self._booted_at),
+            "wifi_signal": -50,
+            "messages": self.messages,
+            "version": "0.96",
+            "indicator1": self.indicators[1] is not None,
+            "indicator2": self.indicators[2] is not None,
+            "indicator3": self.indicators[3] is not None,
+            "app": self.current_app,
+            "uid": "awtrix_emulator",
+            "matrix": self.power,
+        }
+
+    def _get_effects(self) -> list[str]:
+        return [effect.value for effect in EffectType]
+
+    def _get_transitions(self) -> list[str]:
+        return [transition.name.capitalize() for transition in TransitionType]
+
+    def _get_loop(self) -> dict[str, int]:
+        return {name: i for i, name in enumerate(self.loop)}
+
+    def _get_screen(self) -> list[int]:
+        return self.screen
+
+    def _get_settings(self) -> dict[str, Any]:
+        return self.settings
+
+    def _post_power(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        self.power = bool(data and data.get("power"))
+        return 200, b"OK"
+
+    def _post_sleep(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        self.power = False
+        return 200, b"OK"
+
+    def _post_sound(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return 200, b"OK"
+
+    def _post_rtttl(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return 200, b"OK"
+
+    def _post_moodlight(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        self.moodlight = data or None
+        return 200, b"OK"
+
+    def _set_indicator(self, indicator: int, data: Any) -> tuple[int, bytes]:
+        color = (data or {}).get("color")
+        hidden = color in (None, 0, "0", "#000000")
+        self.indicators[indicator] = None if hidden else data
+        return 200, b"OK"
+
+    def _post_indicator1(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return self._set_indicator(1, data)
+
+    def _post_indicator2(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return self._set_indicator(2, data)
+
+    def _post_indicator3(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return self._set_indicator(3, data)
+
+    def _remove_apps(self, prefix: str) -> None:
+        for name in [name for name in self.apps if name.startswith(prefix)]:
+            del self.apps[name]
+            del self._app_sizes[name]
+        if self.current_app not in self.loop:
+            self.current_app = NATIVE_APPS[0]
+
+    def _post_custom(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        name = query.get("name")
+        if not name:
+            return 400, b"Missing name"
+
+        if not data:
+            # an empty payload erases every application starting with this name
+            self._remove_apps(name)
+            return 200, b"OK"
+
+        apps = (
+            {f"{name}{i}": app for i, app in enumerate(data)}
+            if isinstance(data, list)
+            else {name: data}
+        )
+        sizes = {app_name: len(json.dumps(app)) for app_name, app in apps.items()}
+        released = sum(self._app_sizes.get(app_name, 0) for app_name in apps)
+        if sum(sizes.values()) > self.free_ram + released:
+            return 500, b"Not enough memory"
+
+        self.apps.update(apps)
+        self._app_sizes.update(sizes)
+        return 200, b"OK"
+
+    def _post_notify(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        self.notifications.append(data or {})
+        self.messages += 1
+        return 200, b"OK"
+
+    def _post_notify_dismiss(
+        self, data: Any, query: dict[str, str]
+    ) -> tuple[int, bytes]:
+        if self.notifications:
+            self.notifications.pop(0)
+        return 200, b"OK"
+
+    def _step_app(self, step: int) -> tuple[int, bytes]:
+        loop = self.loop
+        self.current_app = loop[(loop.index(self.current_app) + step) % len(loop)]
+        return 200, b"OK"
+
+    def _post_nextapp(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return self._step_app(1)
+
+    def _post_previousapp(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return self._step_app(-1)
+
+    def _post_switch(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        name = (data or {}).get("name")
+        if name not in self.loop:
+            return 500, b"FAILED"
+        self.current_app = name
+        return 200, b"OK"
+
+    def _post_settings(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        # like the firmware, unknown keys are ignored
+        for key, value in (data or {}).items():
+            if key in self.settings:
+                self.settings[key] = value
+        return 200, b"OK"
+
+    def _post_doupdate(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        return 200, b"NoUpdateFound"
+
+    def _post_reboot(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        # custom applications live in memory only
+        self._reset(settings=False)
+        return 200, b"OK"
+
+    def _post_erase(self, data: Any, query: dict[str, str]) -> tuple[int, bytes]:
+        self._reset(settings=True)
+        return 200, b"OK"
+
+    def _post_resetSettings(
+        self, data: Any, query: dict[str, str]
+    ) -> tuple[int, bytes]:
+        self.settings = dict(DEFAULT_SETTINGS)
+        return 200, b"OK"
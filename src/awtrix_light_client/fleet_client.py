@@ -0,0 +1,333 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Literal,
+    Mapping,
+    TypeVar,
+)
+
+from pydantic_extra_types.color import Color
+
+from .http_client import (
+    AwtrixLightHttpClient,
+    AwtrixLightHttpClientError,
+    _build_async_client,
+    _client_options,
+)
+from .http_metrics import MetricsRegistry
+from .http_settings import AwtrixHttpConfig, AwtrixLightFleetClientSettings
+from .models.application import CompiledApplication, CustomApplication, Notification
+from .models.effect import EffectType
+from .models.loop import Loop
+from .models.moodlight import Moodlight
+from .models.screen import Screen
+from .models.setting import Settings
+from .models.stat import Stats
+from .models.transition import TransitionType
+
+T = TypeVar("T")
+
+
+@dataclass
+class FleetResult(Generic[T]):
+    """Outcome of a call made on one device of the fleet
+
+    :param device: Name of the device
+    :param result: Value returned by the device when the call succeeded
+    :param error: Exception raised when the call failed
+    """
+
+    device: str
+    result: T | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: True if the call succeeded on this device
+        """
+        return self.error is None
+
+
+class AwtrixLightFleetClient:
+    def __init__(
+        self,
+        clients: Mapping[str, AwtrixLightHttpClient],
+        max_concurrency: int = 10,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        :param clients: Awtrix-light HTTP clients indexed by device name
+        :param max_concurrency: Maximum number of devices called at the same time
+        :param timeout: Maximum time in seconds given to each device to answer, no limit if None
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        self._clients = dict(clients)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._timeout = timeout
+
+    @property
+    def devices(self) -> list[str]:
+        """
+        :return: Name of the devices in the fleet
+        """
+        return list(self._clients)
+
+    async def _run_on_device(
+        self,
+        device: str,
+        call: Callable[[AwtrixLightHttpClient], Awaitable[T]],
+    ) -> FleetResult[T]:
+        async with self._semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    call(self._clients[device]), self._timeout
+                )
+            except (Exception, AwtrixLightHttpClientError) as e:
+                return FleetResult(device=device, error=e)
+
+        return FleetResult(device=device, result=result)
+
+    async def run(
+        self,
+        call: Callable[[AwtrixLightHttpClient], Awaitable[T]],
+        devices: Iterable[str] | None = None,
+    ) -> dict[str, FleetResult[T]]:
+        """
+        Run a call on every device of the fleet concurrently, a failing or slow device doesn't prevent the others to be called
+        :param call: Coroutine function called with the client of each device
+        :param devices: Name of the devices to call, all devices if None
+        :return: Return a `FleetResult` per device name
+        """
+        names = self.devices if devices is None else list(devices)
+
+        for name in names:
+            if name not in self._clients:
+                raise KeyError(f"unknown device {name}")
+
+        results = await asyncio.gather(
+            *(self._run_on_device(name, call) for name in names)
+        )
+
+        return {result.device: result for result in results}
+
+    async def get_stats(self) -> dict[str, FleetResult[Stats]]:
+        """
+        General device stats (e.g., battery, RAM) of every device
+        :return: Return a `FleetResult` of `Stats` per device name
+        """
+        return await self.run(lambda client: client.get_stats())
+
+    async def get_effects(self) -> dict[str, FleetResult[list[EffectType]]]:
+        """
+        list of all effects of every device
+        :return: Return a `FleetResult` of a list of `EffectType` per device name
+        """
+        return await self.run(lambda client: client.get_effects())
+
+    async def get_transitions(self) -> dict[str, FleetResult[list[TransitionType]]]:
+        """
+        list of all transition effects of every device
+        :return: Return a `FleetResult` of a list of `TransitionType` per device name
+        """
+        return await self.run(lambda client: client.get_transitions())
+
+    async def get_loops(self) -> dict[str, FleetResult[Loop]]:
+        """
+        list of all apps in the loop of every device
+        :return: Return a `FleetResult` of `Loop` per device name
+        """
+        return await self.run(lambda client: client.get_loops())
+
+    async def get_screen(self) -> dict[str, FleetResult[Screen]]:
+        """
+        Retrieve the current matrix screen of every device
+        :return: Return a `FleetResult` of `Screen` per device name
+        """
+        return await self.run(lambda client: client.get_screen())
+
+    async def set_power(self, power: bool) -> dict[str, FleetResult[None]]:
+        """
+        Toggle the matrix on or off on every device
+        :param power: Toggle the matrix
+        """
+        return await self.run(lambda client: client.set_power(power))
+
+    async def set_sleep(self, seconds: int) -> dict[str, FleetResult[None]]:
+        """
+        Send every device in deep sleep mode
+        :param seconds: Duration of sleep mode
+        """
+        return await self.run(lambda client: client.set_sleep(seconds))
+
+    async def set_sound(self, sound: str) -> dict[str, FleetResult[None]]:
+        """
+        Play a RTTTL sound from the MELODIES folder on every device
+        :param sound: Sound to play
+        """
+        return await self.run(lambda client: client.set_sound(sound))
+
+    async def set_rtttl(self, rtttl: str) -> dict[str, FleetResult[None]]:
+        """
+        Play a RTTTL sound from a given RTTTL string on every device
+        :param rtttl: Sound to play in RTTTL format
+        """
+        return await self.run(lambda client: client.set_rtttl(rtttl))
+
+    async def set_moodlight(self, moodlight: Moodlight) -> dict[str, FleetResult[None]]:
+        """
+        Set the entire matrix to a custom color or temperature on every device
+        :param moodlight: Custom color or temperature to set
+        """
+        return await self.run(lambda client: client.set_moodlight(moodlight))
+
+    async def set_indicator(
+        self,
+        indicator: Literal[1, 2, 3],
+        color: Color | int,
+        blink: int | None = None,
+        fade: int | None = None,
+    ) -> dict[str, FleetResult[None]]:
+        """
+        Set a colored indicator on every device
+        :param indicator: Indicator (Upper right corner = 1, Right side = 2, Lower right corner = 3)
+        :param color: Color to display, or a color packed as a 0xRRGGBB integer. To hide the indicators pass black as Color
+        :param blink: Blink timer in milliseconds
+        :param fade: Fade timer in milliseconds
+        """
+        if blink and fade:
+            raise ValueError("fade and blink can't be set together")
+
+        return await self.run(
+            lambda client: client.set_indicator(indicator, color, blink, fade)
+        )
+
+    async def set_custom_application(
+        self,
+        name: str,
+        custom_application: CustomApplication
+        | CompiledApplication[CustomApplication]
+        | list[CustomApplication]
+        | None,
+    ) -> dict[str, FleetResult[None]]:
+        """
+        Set custom app or a list of custom app on every device
+        :param name: Name of the application to manage
+        :param custom_application: An application, a compiled application, a list of application to setup or None
+        """
+        return await self.run(
+            lambda client: client.set_custom_application(name, custom_application)
+        )
+
+    async def notify(
+        self, notification: Notification | CompiledApplication[Notification]
+    ) -> dict[str, FleetResult[None]]:
+        """
+        One-Time Notification on every device
+        :param notification: Notification or compiled notification to display
+        """
+        return await self.run(lambda client: client.notify(notification))
+
+    async def dismiss_notification(self) -> dict[str, FleetResult[None]]:
+        """
+        Dismiss a notification that was configured with "hold": true on every device
+        """
+        return await self.run(lambda client: client.dismiss_notification())
+
+    async def next_app(self) -> dict[str, FleetResult[None]]:
+        """
+        Navigate to the next app on every device
+        """
+        return await self.run(lambda client: client.next_app())
+
+    async def previous_app(self) -> dict[str, FleetResult[None]]:
+        """
+        Navigate to the previous app on every device
+        """
+        return await self.run(lambda client: client.previous_app())
+
+    async def switch_app(self, name: str) -> dict[str, FleetResult[None]]:
+        """
+        Directly transition to a desired app using its name on every device
+        :param name: Application to switch to
+        """
+        return await self.run(lambda client: client.switch_app(name))
+
+    async def get_settings(self) -> dict[str, FleetResult[Settings]]:
+        """
+        Settings of every device
+        :return: Return a `FleetResult` of `Settings` per device name
+        """
+        return await self.run(lambda client: client.get_settings())
+
+    async def set_settings(
+        self, s: Settings, exclude_unset: bool = False
+    ) -> dict[str, FleetResult[None]]:
+        """
+        Adjust various settings related to the app display on every device
+        :param s: Settings to update
+        :param exclude_unset: Only send the fields explicitly set on `s`, otherwise `BRI` is always sent
+        """
+        return await self.run(lambda client: client.set_settings(s, exclude_unset))
+
+    async def update(self) -> dict[str, FleetResult[None]]:
+        """
+        Initiate the firmware update on every device
+        """
+        return await self.run(lambda client: client.update())
+
+    async def reboot(self) -> dict[str, FleetResult[None]]:
+        """
+        Restart every device
+        """
+        return await self.run(lambda client: client.reboot())
+
+    async def erase(self) -> dict[str, FleetResult[None]]:
+        """
+        WARNING: This action will format the flash memory and EEPROM of every device but will not modify the WiFi Settings.
+        """
+        return await self.run(lambda client: client.erase())
+
+    async def reset_settings(self) -> dict[str, FleetResult[None]]:
+        """
+        WARNING: This action will reset all settings from the settings API of every device.
+        """
+        return await self.run(lambda client: client.reset_settings())
+
+
+@asynccontextmanager
+async def get_awtrix_fleet_client(
+    devices: Mapping[str, AwtrixHttpConfig] | None = None,
+    metrics: MetricsRegistry | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[AwtrixLightFleetClient]:
+    """Gives access to an instance of the Awtrix-light fleet client
+
+    :param devices: Configuration of each device indexed by device name, read from the environment if None
+    :param metrics: Registry shared by the clients of every device, disabled if None
+    :param kwargs: Extra options forwarded to `AwtrixLightFleetClient`
+    :return: An `asynccontextmanager` of `AwtrixLightFleetClient`
+    """
+    if devices is None:
+        devices = AwtrixLightFleetClientSettings().devices
+
+    async with AsyncExitStack() as stack:
+        clients = {
+            name: AwtrixLightHttpClient(
+                await stack.enter_async_context(_build_async_client(config)),
+                **_client_options(config),
+                metrics=metrics,
+            )
+            for name, config in devices.items()
+        }
+
+        yield AwtrixLightFleetClient(clients, **kwargs)
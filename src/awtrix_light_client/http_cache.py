@@ -0,0 +1,123 @@
+import time
+from typing import Mapping
+
+from .http_dedup import RESET_ENDPOINTS
+
+CACHE_TTLS = {"effects": 3600.0, "transitions": 3600.0, "settings": 60.0, "loop": 10.0}
+"""Default time to live in seconds of the cached GET endpoints"""
+
+INVALIDATED_ENDPOINTS = {
+    # settings also turn the native apps on or off
+    "settings": frozenset({"settings", "loop"}),
+    "resetSettings": frozenset({"settings", "loop"}),
+    "custom": frozenset({"loop"}),
+}
+"""Cached GET endpoints invalidated by each POST endpoint"""
+
+
+class ResponseCache:
+    def __init__(self, ttls: Mapping[str, float] = CACHE_TTLS) -> None:
+        """
+        Read-through cache of the raw bodies of GET endpoints whose content rarely changes, per device and firmware version.
+        POST requests changing a cached endpoint invalidate it, entries of a device are dropped when it reboots, is updated, erased
+        or reports another firmware version in its stats.
+        A body changed on the device without going through the client is served until its time to live ends or `invalidate` is called.
+        :param ttls: Time to live in seconds of each cached GET endpoint, other endpoints are not cached
+        """
+        self.ttls = dict(ttls)
+        self._versions: dict[str, str] = {}
+        self._entries: dict[tuple[str, str, str | None], tuple[bytes, float]] = {}
+        self._generation = 0
+        self._generations: dict[str, int] = {}
+
+    def generation(self, device: str) -> int:
+        """
+        Read before fetching a body and give it to `set`, so a body fetched before an invalidation is not stored
+        :param device: Device identifier
+        :return: Number of invalidations of the device entries
+        """
+        return self._generation + self._generations.get(device, 0)
+
+    def get(self, device: str, endpoint: str) -> bytes | None:
+        """
+        :param device: Device identifier
+        :param endpoint: GET endpoint
+        :return: Cached body, None if missing or expired
+        """
+        key = (device, endpoint, self._versions.get(device))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        content, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return content
+
+    def set(
+        self,
+        device: str,
+        endpoint: str,
+        content: bytes,
+        generation: int | None = None,
+    ) -> None:
+        """
+        :param device: Device identifier
+        :param endpoint: GET endpoint
+        :param content: Body of the response
+        :param generation: `generation` of the device when the request was sent, the body is dropped if the entries were invalidated since
+        """
+        ttl = self.ttls.get(endpoint)
+        if ttl is None:
+            return
+        if generation is not None and generation != self.generation(device):
+            return
+        self._entries[(device, endpoint, self._versions.get(device))] = (
+            content,
+            time.monotonic() + ttl,
+        )
+
+    def observe_version(self, device: str, version: str) -> None:
+        """
+        Record the firmware version reported by the device, entries of another version are dropped
+        :param device: Device identifier
+        :param version: Firmware version
+        """
+        if self._versions.get(device) != version:
+            self._versions[device] = version
+            self.invalidate(device)
+
+    def invalidate_for(self, device: str, endpoint: str) -> None:
+        """
+        Drop the entries a POST request may have changed
+        :param device: Device identifier
+        :param endpoint: POST endpoint
+        """
+        if endpoint in RESET_ENDPOINTS:
+            self.invalidate(device)
+            return
+
+        for invalidated in INVALIDATED_ENDPOINTS.get(endpoint, ()):
+            self.invalidate(device, invalidated)
+
+    def invalidate(
+        self, device: str | None = None, endpoint: str | None = None
+    ) -> None:
+        """
+        Forget cached bodies, the next GET of the matching endpoints reaches the device
+        :param device: Only forget bodies of this device, all devices if None
+        :param endpoint: Only forget bodies of this endpoint, all endpoints if None
+        """
+        if device is None:
+            self._generation += 1
+        else:
+            self._generations[device] = self._generations.get(device, 0) + 1
+
+        for key in list(self._entries):
+            key_device, key_endpoint, _ = key
+            if device is not None and key_device != device:
+                continue
+            if endpoint is not None and key_endpoint != endpoint:
+                continue
+            del self._entries[key]
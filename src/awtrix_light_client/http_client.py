@@ -1,20 +1,44 @@
+import asyncio
 import ssl
+import time
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import PurePath
-from typing import Any, AsyncIterator, Literal
+from typing import Any, AsyncIterator, Literal, NamedTuple
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Response, Timeout, TransportError
+from pydantic import TypeAdapter
 from pydantic_extra_types.color import Color
 
-from .http_settings import AwtrixLightHttpClientSettings
-from .models.application import CustomApplication, Notification
+from .http_cache import ResponseCache
+from .http_coalescing import LatestWinsCoalescer
+from .http_dedup import RESET_ENDPOINTS, PayloadDeduplicator
+from .http_dispatch import DeviceDispatcher, PriorityDispatcher
+from .http_metrics import MetricsRegistry
+from .http_rate_limit import RateLimiter
+from .http_retry import CircuitBreaker, RetryPolicy
+from .http_settings import AwtrixHttpConfig, AwtrixLightHttpClientSettings
+from .json_codec import JsonCodec, get_default_codec
+from .models.application import CompiledApplication, CustomApplication, Notification
 from .models.effect import EffectType
 from .models.loop import Loop
 from .models.moodlight import Moodlight
-from .models.screen import Screen
+from .models.screen import PackedScreen, Screen
 from .models.setting import Settings
 from .models.stat import Stats
 from .models.transition import TransitionType
+from .models.utils import convert_color_to_hex
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class _EncodedPayload(NamedTuple):
+    content: bytes
+    serialization: float
+
+
+# built once, building an adapter compiles a validator
+_EFFECTS_ADAPTER = TypeAdapter(list[EffectType])
 
 
 class AwtrixLightHttpClientError(BaseException):
@@ -30,6 +54,24 @@ class AwtrixLightHttpClientError(BaseException):
         self.content = content
 
 
+class AwtrixLightCircuitOpenError(AwtrixLightHttpClientError):
+    """Raised without contacting the device while its circuit breaker is open
+
+    :param retry_after: Time in seconds before a new request is let through
+    """
+
+    def __init__(self, retry_after: float, *args: object) -> None:
+        super().__init__(503, "circuit breaker is open", *args)
+        self.retry_after = retry_after
+
+
+class AwtrixLightRateLimitedError(AwtrixLightHttpClientError):
+    """Raised without contacting the device when a rate limiter in drop mode has no token left for the request"""
+
+    def __init__(self, *args: object) -> None:
+        super().__init__(429, "rate limit exceeded", *args)
+
+
 def _normalize_verify(verify: PurePath | str | bool) -> ssl.SSLContext | bool:
     if isinstance(verify, PurePath):
         verify = str(verify)
@@ -41,50 +83,325 @@ def _normalize_verify(verify: PurePath | str | bool) -> ssl.SSLContext | bool:
 
 
 class AwtrixLightHttpClient:
-    def __init__(self, client: AsyncClient) -> None:
+    def __init__(
+        self,
+        client: AsyncClient,
+        max_in_flight: int | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        coalescer: LatestWinsCoalescer | None = None,
+        deduplicator: PayloadDeduplicator | None = None,
+        codec: JsonCodec | None = None,
+        metrics: MetricsRegistry | None = None,
+        cache: ResponseCache | None = None,
+        single_flight: bool = False,
+        dispatcher: DeviceDispatcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         """
         :param client: `AsyncClient`
-        """
+        :param max_in_flight: Maximum number of requests sent to the device at the same time, in arrival order, no limit if None
+        :param retry_policy: Policy used to retry failed requests, no retry if None
+        :param circuit_breaker: Circuit breaker failing fast while the device is down, disabled if None
+        :param coalescer: Coalesce `set_custom_application` updates per application name, only the latest pending update is sent, disabled if None
+        :param deduplicator: Skip sending a payload the device already accepted, disabled if None
+        :param codec: JSON codec of the request and response bodies, the fastest one installed if None
+        :param metrics: Registry recording latency, sizes and errors of the requests, disabled if None
+        :param cache: Cache of the effects, transitions, settings and loop responses, disabled if None
+        :param single_flight: Concurrent GET requests of the same endpoint share a single request to the device
+        :param dispatcher: Queue of the requests sent to the device, to share with other clients of the device, `max_in_flight` is ignored if set
+        :param rate_limiter: Token buckets limiting the requests sent to the device, each retry takes a token, disabled if None
+        """
+        if dispatcher is None and max_in_flight is not None:
+            dispatcher = DeviceDispatcher(max_in_flight)
+
         self._client = client
+        self._dispatcher = dispatcher
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._coalescer = coalescer
+        self._deduplicator = deduplicator
+        self._codec = codec if codec is not None else get_default_codec()
+        self._metrics = metrics
+        self._cache = cache
+        self._pending_gets: dict[str, asyncio.Task] | None = (
+            {} if single_flight else None
+        )
+        self._device = str(client.base_url)
 
-    async def _make_request(
+    async def _send(
         self,
         method: str,
         url: str,
         params: dict[Any, Any] | None = None,
-        data: dict[Any, Any] | None = None,
-    ):
-        """Boilerplate to make request to the APU. Handling error is done for you here."""
-        r = await self._client.request(method, url, params=params, json=data)
+        data: Any = None,
+    ) -> Response:
+        serialization = 0.0
+        if isinstance(data, CompiledApplication):
+            # already encoded, sent as is
+            kwargs = {"content": data.content, "headers": _JSON_HEADERS}
+        elif isinstance(data, _EncodedPayload):
+            kwargs = {"content": data.content, "headers": _JSON_HEADERS}
+            serialization = data.serialization
+        elif data is not None:
+            start = time.perf_counter()
+            kwargs = {"content": self._codec.dumps(data), "headers": _JSON_HEADERS}
+            serialization = time.perf_counter() - start
+        else:
+            kwargs = {}
+
+        return await self._dispatch(method, url, params, kwargs, serialization)
+
+    async def _dispatch(
+        self,
+        method: str,
+        url: str,
+        params: dict[Any, Any] | None,
+        kwargs: dict[str, Any],
+        serialization: float,
+    ) -> Response:
+        if self._metrics is None:
+            return await self._client.request(method, url, params=params, **kwargs)
+
+        self._metrics.request_started(self._device, url)
+        start = time.perf_counter()
+        r = None
+        try:
+            r = await self._client.request(method, url, params=params, **kwargs)
+            return r
+        finally:
+            self._metrics.request_finished(
+                self._device,
+                url,
+                latency=time.perf_counter() - start,
+                serialization=serialization,
+                request_size=len(kwargs.get("content", b"")),
+                response_size=len(r.content) if r is not None else 0,
+                error=r is None or r.is_error,
+            )
+
+    def _record_outcome(self, failed: bool) -> None:
+        if self._circuit_breaker is None:
+            return
+
+        if failed:
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
 
-        if not r.is_success:
-            raise AwtrixLightHttpClientError(status_code=r.status_code, content=r.text)
+    async def _make_request(
+        self,
+        method: str,
+        url: str,
+        params: dict[Any, Any] | None = None,
+        data: Any = None,
+    ) -> Response | None:
+        """Boilerplate to make request to the APU. Handling error, retries and circuit breaking are done for you here.
+
+        :param data: JSON payload, or a `CompiledApplication` whose encoded payload is sent as is
+        :return: The response, or None when the request was skipped because the device already accepted the same payload
+        """
+        if method != "POST" or (self._cache is None and self._pending_gets is None):
+            return await self._deduplicated_request(method, url, params, data)
+
+        # a GET started before this request must not be shared with callers expecting its effect
+        self._forget_pending_gets()
+        try:
+            return await self._deduplicated_request(method, url, params, data)
+        finally:
+            # even a failed request may have been applied by the device
+            if self._cache is not None:
+                self._cache.invalidate_for(self._device, url)
+            self._forget_pending_gets()
+
+    def _forget_pending_gets(self) -> None:
+        if self._pending_gets is not None:
+            self._pending_gets.clear()
+
+    async def _deduplicated_request(
+        self,
+        method: str,
+        url: str,
+        params: dict[Any, Any] | None,
+        data: Any,
+    ) -> Response | None:
+        if self._deduplicator is None or method != "POST":
+            return await self._request(method, url, params=params, data=data)
+
+        if url in RESET_ENDPOINTS:
+            self._deduplicator.invalidate(self._device)
+
+        if url not in self._deduplicator.endpoints:
+            return await self._request(method, url, params=params, data=data)
+
+        name = (params or {}).get("name")
+        payload = data
+        if isinstance(data, CompiledApplication):
+            content = data.content
+        else:
+            # encoded once, the hashed bytes are the ones sent
+            start = time.perf_counter()
+            content = self._codec.dumps(data)
+            payload = _EncodedPayload(content, time.perf_counter() - start)
+
+        digest = self._deduplicator.digest(content)
+        if data and self._deduplicator.is_duplicate(self._device, url, name, digest):
+            return None
+
+        try:
+            r = await self._request(method, url, params=params, data=payload)
+        except BaseException:
+            # the device may or may not have applied the payload, even when the send was cancelled
+            self._deduplicator.invalidate(self._device, url, name)
+            raise
+
+        self._deduplicator.remember(self._device, url, name, data, digest)
         return r
 
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        params: dict[Any, Any] | None = None,
+        data: Any = None,
+    ) -> Response:
+        if self._dispatcher is None:
+            return await self._retried_request(method, url, params, data)
+
+        # the slot is kept during the retries so a later write can't overtake a retried one
+        async with self._dispatcher.slot(url):
+            return await self._retried_request(method, url, params, data)
+
+    async def _retried_request(
+        self,
+        method: str,
+        url: str,
+        params: dict[Any, Any] | None,
+        data: Any,
+    ) -> Response:
+        attempt = 0
+        while True:
+            # checked first so failing fast neither waits for nor takes tokens
+            if (
+                self._circuit_breaker is not None
+                and not self._circuit_breaker.allow_request()
+            ):
+                raise AwtrixLightCircuitOpenError(
+                    retry_after=self._circuit_breaker.retry_after()
+                )
+
+            if self._rate_limiter is not None:
+                await self._throttle(url)
+
+            try:
+                r = await self._send(method, url, params=params, data=data)
+            except TransportError as e:
+                self._record_outcome(failed=True)
+                if (
+                    self._retry_policy is None
+                    or attempt >= self._retry_policy.max_retries
+                    or not self._retry_policy.should_retry_error(method, url, e)
+                ):
+                    raise
+            else:
+                self._record_outcome(failed=r.is_server_error)
+                if r.is_success:
+                    return r
+
+                if (
+                    self._retry_policy is None
+                    or attempt >= self._retry_policy.max_retries
+                    or not self._retry_policy.should_retry_status(
+                        method, url, r.status_code
+                    )
+                ):
+                    raise AwtrixLightHttpClientError(
+                        status_code=r.status_code, content=r.text
+                    )
+
+            await asyncio.sleep(self._retry_policy.delay(attempt))
+            attempt += 1
+
+    async def _throttle(self, url: str) -> None:
+        delay = self._rate_limiter.acquire(self._device, url)
+        if delay is None:
+            if self._metrics is not None:
+                self._metrics.request_throttled(self._device, url, None)
+            raise AwtrixLightRateLimitedError()
+
+        if delay > 0:
+            if self._metrics is not None:
+                self._metrics.request_throttled(self._device, url, delay)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # the reserved tokens would otherwise throttle the next requests
+                self._rate_limiter.refund(self._device, url)
+                raise
+
+    async def _fetch(self, url: str) -> bytes:
+        """Body of a GET request, served from the cache when possible
+
+        :param url: Endpoint to get
+        :return: The response body
+        """
+        generation = None
+        if self._cache is not None:
+            content = self._cache.get(self._device, url)
+            if content is not None:
+                return content
+            generation = self._cache.generation(self._device)
+
+        if self._pending_gets is None:
+            content = (await self._make_request("GET", url)).content
+        else:
+            content = await self._shared_get(url)
+
+        if self._cache is not None:
+            self._cache.set(self._device, url, content, generation)
+        return content
+
+    async def _shared_get(self, url: str) -> bytes:
+        task = self._pending_gets.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._make_request("GET", url))
+            task.add_done_callback(partial(self._get_done, url))
+            self._pending_gets[url] = task
+
+        # a cancelled caller must not cancel the request shared with the others
+        return (await asyncio.shield(task)).content
+
+    def _get_done(self, url: str, task: asyncio.Task) -> None:
+        if self._pending_gets.get(url) is task:
+            del self._pending_gets[url]
+        # avoid "exception was never retrieved" warnings when every caller is gone
+        if not task.cancelled():
+            task.exception()
+
     async def get_stats(self) -> Stats:
         """
         General device stats (e.g., battery, RAM)
         :return: Return a `Stats` object
         """
-        response = (await self._make_request("GET", "stats")).json()
-
-        return Stats(**response)
+        stats = Stats.model_validate_json(await self._fetch("stats"))
+        if self._cache is not None:
+            self._cache.observe_version(self._device, stats.version)
+        return stats
 
     async def get_effects(self) -> list[EffectType]:
         """
         list of all effects
         :return: Return a list of `EffectType` object
         """
-        response = (await self._make_request("GET", "effects")).json()
-
-        return [EffectType(e) for e in response]
+        return _EFFECTS_ADAPTER.validate_json(await self._fetch("effects"))
 
     async def get_transitions(self) -> list[TransitionType]:
         """
         list of all transition effects
         :return: Return a list of `TransitionType` object
         """
-        response = (await self._make_request("GET", "transitions")).json()
+        response = self._codec.loads(await self._fetch("transitions"))
 
         return [(TransitionType[t.upper()]) for t in response]
 
@@ -93,7 +410,7 @@ class AwtrixLightHttpClient:
         list of all apps in the loop
         :return: Return a `Loop` object
         """
-        response = (await self._make_request("GET", "loop")).json()
+        response = self._codec.loads(await self._fetch("loop"))
 
         sorted_apps = dict(sorted(response.items(), key=lambda item: item[1]))
 
@@ -104,9 +421,68 @@ class AwtrixLightHttpClient:
         Retrieve the current matrix screen as an array of 24 bit colors
         :return: Return a `Screen` object
         """
-        response = (await self._make_request("GET", "screen")).json()
+        content = await self._fetch("screen")
+
+        # the body is the bare matrix array, wrap it to validate the model in one pass
+        return Screen.model_validate_json(b'{"matrix":' + content + b"}")
+
+    async def get_packed_screen(self) -> PackedScreen:
+        """
+        Retrieve the current matrix screen in a compact form, skipping pydantic validation
+        :return: Return a `PackedScreen` object
+        """
+        return PackedScreen.from_json(await self._fetch("screen"), self._codec)
+
+    async def _poll_screen(self, fps: float, max_load: float) -> AsyncIterator[bytes]:
+        if fps <= 0:
+            raise ValueError("fps must be greater than 0")
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be between 0 and 1")
+
+        loop = asyncio.get_running_loop()
+        previous = None
+        rtt = None
+
+        while True:
+            start = loop.time()
+            content = await self._fetch("screen")
+            elapsed = loop.time() - start
+            # exponentially weighted moving average to smooth Wi-Fi jitter
+            rtt = elapsed if rtt is None else 0.8 * rtt + 0.2 * elapsed
+
+            # identical frames are serialized identically, skip them before parsing
+            if content != previous:
+                previous = content
+                yield content
+
+            delay = max(1 / fps, rtt / max_load) - (loop.time() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
 
-        return Screen(matrix=response)
+    async def stream_screen(
+        self, fps: float = 10, max_load: float = 0.5
+    ) -> AsyncIterator[Screen]:
+        """
+        Poll the matrix screen and yield a `Screen` each time it changes
+        The poll interval adapts to the measured round trip time, so that the device doesn't spend more than `max_load` of its time answering
+        :param fps: Maximum number of polls per second
+        :param max_load: Maximum share of time the device spends serving the screen, between 0 and 1
+        :return: Return an async iterator of `Screen` objects
+        """
+        async for content in self._poll_screen(fps, max_load):
+            yield Screen.model_validate_json(b'{"matrix":' + content + b"}")
+
+    async def stream_packed_screen(
+        self, fps: float = 10, max_load: float = 0.5
+    ) -> AsyncIterator[PackedScreen]:
+        """
+        Same as `stream_screen` but yield compact `PackedScreen` objects, suited to recording and mirroring at high frame rates
+        :param fps: Maximum number of polls per second
+        :param max_load: Maximum share of time the device spends serving the screen, between 0 and 1
+        :return: Return an async iterator of `PackedScreen` objects
+        """
+        async for content in self._poll_screen(fps, max_load):
+            yield PackedScreen.from_json(content, self._codec)
 
     async def set_power(self, power: bool) -> None:
         """
@@ -148,21 +524,21 @@ class AwtrixLightHttpClient:
     async def set_indicator(
         self,
         indicator: Literal[1, 2, 3],
-        color: Color,
+        color: Color | int,
         blink: int | None = None,
         fade: int | None = None,
     ) -> None:
         """
         Colored indicators serve as small notification signs displayed on specific areas of the screen:
         :param indicator: Indicator (Upper right corner = 1, Right side = 2, Lower right corner = 3)
-        :param color: Color to display. To hide the indicators pass black as Color
+        :param color: Color to display, or a color packed as a 0xRRGGBB integer. To hide the indicators pass black as Color
         :param blink: Blink timer in milliseconds
         :param fade: Fade timer in milliseconds
         """
         if blink and fade:
             raise ValueError("fade and blink can't be set together")
 
-        data = {"color": color.as_hex(format="long").upper()}
+        data = {"color": convert_color_to_hex(color)}
 
         if blink:
             data["blink"] = blink
@@ -179,31 +555,51 @@ class AwtrixLightHttpClient:
     async def set_custom_application(
         self,
         name: str,
-        custom_application: CustomApplication | list[CustomApplication] | None,
+        custom_application: CustomApplication
+        | CompiledApplication[CustomApplication]
+        | list[CustomApplication]
+        | None,
     ) -> None:
         """
         Set custom app or a list of custom app
         When erasing apps, AWTRIX doesn't match the exact app name. Instead, it identifies apps that begin with the specified name.
         To expunge all associated apps, send application=None. For example for name=test. This action will remove test0, test1, and so on.
         To eradicate a single app, direct the command to, for instance, test1
+        When a coalescer is set and an update of the same app is already in flight, this update replaces any pending one and
+        the call returns once the latest update has been sent
         :param name: Name of the application to manage
-        :param custom_application: An application, a list of application to setup or None
+        :param custom_application: An application, a compiled application, a list of application to setup or None
         """
-        if isinstance(custom_application, CustomApplication):
+        if isinstance(custom_application, CompiledApplication):
+            data = custom_application
+        elif isinstance(custom_application, CustomApplication):
             data = custom_application.model_dump(exclude_none=True)
         else:
             data = [app.model_dump(exclude_none=True) for app in custom_application]
 
-        await self._make_request("POST", "custom", params={"name": name}, data=data)
-
-    async def notify(self, notification: Notification) -> None:
+        if self._coalescer is None:
+            await self._make_request("POST", "custom", params={"name": name}, data=data)
+        else:
+            await self._coalescer.submit(
+                name,
+                lambda: self._make_request(
+                    "POST", "custom", params={"name": name}, data=data
+                ),
+            )
+
+    async def notify(
+        self, notification: Notification | CompiledApplication[Notification]
+    ) -> None:
         """
         One-Time Notification
-        :param notification: Notification to display
+        :param notification: Notification or compiled notification to display
         """
-        await self._make_request(
-            "POST", "notify", data=notification.model_dump(exclude_none=True)
-        )
+        if isinstance(notification, CompiledApplication):
+            data = notification
+        else:
+            data = notification.model_dump(exclude_none=True)
+
+        await self._make_request("POST", "notify", data=data)
 
     async def dismiss_notification(self) -> None:
         """
@@ -235,15 +631,18 @@ class AwtrixLightHttpClient:
         You can initiate the firmware update either through the update button in HA or using the following
         :return: Return a `Settings` object
         """
-        return Settings(**(await self._make_request("GET", "settings")).json())
+        return Settings.model_validate_json(await self._fetch("settings"))
 
-    async def set_settings(self, s: Settings) -> None:
+    async def set_settings(self, s: Settings, exclude_unset: bool = False) -> None:
         """
         Adjust various settings related to the app display.
         :param s: Settings to update
+        :param exclude_unset: Only send the fields explicitly set on `s`, otherwise `BRI` is always sent
         """
         await self._make_request(
-            "POST", "settings", data=s.model_dump(exclude_none=True)
+            "POST",
+            "settings",
+            data=s.model_dump(exclude_none=True, exclude_unset=exclude_unset),
         )
 
     async def update(self) -> None:
@@ -271,24 +670,88 @@ class AwtrixLightHttpClient:
         await self._make_request("POST", "resetSettings")
 
 
+def _build_async_client(config: AwtrixHttpConfig) -> AsyncClient:
+    """Build the `AsyncClient` used to reach one Awtrix device
+
+    :param config: Configuration of the device
+    :return: An `AsyncClient` pointing to the device API
+    """
+    auth = None
+    if config.username and config.password:
+        auth = (
+            config.username,
+            config.password,
+        )
+
+    return AsyncClient(
+        base_url=f"{config.base_url}api",
+        auth=auth,
+        verify=_normalize_verify(config.verify_ssl),
+        limits=Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=Timeout(
+            connect=config.connect_timeout,
+            read=config.read_timeout,
+            write=config.write_timeout,
+            pool=config.pool_timeout,
+        ),
+    )
+
+
+def _client_options(config: AwtrixHttpConfig) -> dict[str, Any]:
+    """Options of `AwtrixLightHttpClient` read from the device configuration
+
+    :param config: Configuration of the device
+    :return: Keyword arguments of `AwtrixLightHttpClient`
+    """
+    return {
+        "max_in_flight": config.max_in_flight,
+        "dispatcher": (
+            PriorityDispatcher(config.max_in_flight or 1, aging=config.priority_aging)
+            if config.priority_aging is not None
+            else None
+        ),
+        "retry_policy": (
+            RetryPolicy(max_retries=config.max_retries, backoff=config.retry_backoff)
+            if config.max_retries
+            else None
+        ),
+        "circuit_breaker": (
+            CircuitBreaker(
+                failure_threshold=config.circuit_breaker_threshold,
+                recovery_time=config.circuit_breaker_recovery_time,
+            )
+            if config.circuit_breaker_threshold is not None
+            else None
+        ),
+        "cache": ResponseCache() if config.response_cache else None,
+        "rate_limiter": (
+            RateLimiter(
+                config.rate_limit,
+                burst=config.rate_limit_burst,
+                endpoints=config.rate_limit_endpoints,
+                mode=config.rate_limit_mode,
+            )
+            if config.rate_limit is not None
+            else None
+        ),
+        "single_flight": config.single_flight,
+    }
+
+
 @asynccontextmanager
-async def get_awtrix_http_client() -> AsyncIterator[AwtrixLightHttpClient]:
+async def get_awtrix_http_client(**kwargs: Any) -> AsyncIterator[AwtrixLightHttpClient]:
     """Gives access to an instance of the Awtrix-light HTTP client
 
+    :param kwargs: Extra options forwarded to `AwtrixLightHttpClient`, they take precedence over the environment configuration
     :return: An `asynccontextmanager` of `AwtrixLightHttpClient`
     """
     settings = AwtrixLightHttpClientSettings()
 
-    auth = None
-    if settings.awtrix.username and settings.awtrix.password:
-        auth = (
-            settings.awtrix.username,
-            settings.awtrix.password,
+    async with _build_async_client(settings.awtrix) as client:
+        yield AwtrixLightHttpClient(
+            client, **{**_client_options(settings.awtrix), **kwargs}
         )
-
-    async with AsyncClient(
-        base_url=f"{settings.awtrix.base_url}api",
-        auth=auth,
-        verify=_normalize_verify(settings.awtrix.verify_ssl),
-    ) as client:
-        yield AwtrixLightHttpClient(client)
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+def _consume_result(future: asyncio.Future) -> None:
+    # avoid "exception was never retrieved" warnings when every waiter is gone
+    if not future.cancelled():
+        future.exception()
+
+
+class LatestWinsCoalescer:
+    def __init__(self) -> None:
+        """
+        Keep a single send in flight per key, while it runs only the newest pending send is kept and the older ones are dropped.
+        Callers whose send was dropped wait for the send which replaced it and share its outcome.
+        """
+        self._in_flight: set[Hashable] = set()
+        self._pending: dict[
+            Hashable, tuple[Callable[[], Awaitable[None]], asyncio.Future]
+        ] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def pending(self, key: Hashable) -> bool:
+        """
+        :param key: Key of the sends
+        :return: True if a send is waiting for the one in flight to complete
+        """
+        return key in self._pending
+
+    async def submit(self, key: Hashable, send: Callable[[], Awaitable[None]]) -> None:
+        """
+        Run `send` now if nothing is in flight for `key`, otherwise replace the pending send of `key`
+        :param key: Key of the sends, only one send per key is in flight at a time
+        :param send: Coroutine function sending the update
+        """
+        if key in self._in_flight:
+            if key in self._pending:
+                future = self._pending[key][1]
+            else:
+                future = asyncio.get_running_loop().create_future()
+                future.add_done_callback(_consume_result)
+            self._pending[key] = (send, future)
+            await asyncio.shield(future)
+            return
+
+        self._in_flight.add(key)
+        try:
+            await send()
+        finally:
+            self._start_next(key)
+
+    def _start_next(self, key: Hashable) -> None:
+        if key not in self._pending:
+            self._in_flight.discard(key)
+            return
+
+        send, future = self._pending.pop(key)
+        task = asyncio.ensure_future(self._run_pending(key, send, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_pending(
+        self,
+        key: Hashable,
+        send: Callable[[], Awaitable[None]],
+        future: asyncio.Future,
+    ) -> None:
+        try:
+            await send()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+        finally:
+            self._start_next(key)
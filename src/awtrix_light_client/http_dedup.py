@@ -0,0 +1,128 @@
+import hashlib
+import time
+from typing import Any
+
+from .models.application import CompiledApplication
+
+DEDUPLICATED_ENDPOINTS = frozenset(
+    {"custom", "moodlight", "indicator1", "indicator2", "indicator3"}
+)
+"""POST endpoints whose payload replaces the previous one on the device"""
+
+RESET_ENDPOINTS = frozenset({"reboot", "doupdate", "erase"})
+"""POST endpoints wiping the state held by the device"""
+
+
+def _lifetime(data: Any) -> float | None:
+    if isinstance(data, CompiledApplication):
+        return data.lifetime or None
+
+    if isinstance(data, dict):
+        return data.get("lifetime") or None
+
+    lifetimes = [app["lifetime"] for app in data or [] if app.get("lifetime")]
+    return min(lifetimes) if lifetimes else None
+
+
+class PayloadDeduplicator:
+    def __init__(
+        self,
+        endpoints: frozenset[str] = DEDUPLICATED_ENDPOINTS,
+        lifetime_margin: float = 0.2,
+    ) -> None:
+        """
+        Remember a hash of the last payload accepted by each device per endpoint and application name, to skip sending the same payload again.
+        Entries of a custom application expire before its `lifetime` ends, as a skipped send doesn't restart the device timer, so the
+        application is sent again while it is still shown. Entries of a device are dropped when it reboots, is updated or erased.
+        A payload replaced on the device without going through the client is not sent again until its entry expires or `invalidate` is called.
+        :param endpoints: POST endpoints to deduplicate
+        :param lifetime_margin: Fraction of the application `lifetime` before its end at which its entry expires
+        """
+        if not 0 <= lifetime_margin < 1:
+            raise ValueError("lifetime_margin must be between 0 and 1")
+
+        self.endpoints = endpoints
+        self.lifetime_margin = lifetime_margin
+        self._digests: dict[
+            tuple[str, str, str | None], tuple[bytes, float | None]
+        ] = {}
+
+    @staticmethod
+    def digest(content: bytes) -> bytes:
+        """
+        :param content: Encoded payload, as sent to the device
+        :return: Hash of the payload
+        """
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def is_duplicate(
+        self, device: str, endpoint: str, name: str | None, digest: bytes
+    ) -> bool:
+        """
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        :param name: Application name of the request if any
+        :param digest: Hash of the payload
+        :return: True if the device already accepted this payload and it did not expire
+        """
+        entry = self._digests.get((device, endpoint, name))
+        if entry is None:
+            return False
+
+        last_digest, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._digests[(device, endpoint, name)]
+            return False
+
+        return last_digest == digest
+
+    def remember(
+        self, device: str, endpoint: str, name: str | None, data: Any, digest: bytes
+    ) -> None:
+        """
+        Record a payload accepted by the device
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        :param name: Application name of the request if any
+        :param data: JSON payload, used to read the application lifetime
+        :param digest: Hash of the payload
+        """
+        if endpoint == "custom" and not data:
+            # an empty payload erases every application starting with this name
+            self.invalidate(device, endpoint, name, prefix=True)
+            return
+
+        lifetime = _lifetime(data) if endpoint == "custom" else None
+        self._digests[(device, endpoint, name)] = (
+            digest,
+            time.monotonic() + lifetime * (1 - self.lifetime_margin)
+            if lifetime is not None
+            else None,
+        )
+
+    def invalidate(
+        self,
+        device: str | None = None,
+        endpoint: str | None = None,
+        name: str | None = None,
+        prefix: bool = False,
+    ) -> None:
+        """
+        Forget accepted payloads, the next send of the matching payloads will reach the device
+        :param device: Only forget payloads of this device, all devices if None
+        :param endpoint: Only forget payloads of this endpoint, all endpoints if None
+        :param name: Only forget payloads of this application name, all names if None
+        :param prefix: Match every application name starting with `name`
+        """
+        for key in list(self._digests):
+            key_device, key_endpoint, key_name = key
+            if device is not None and key_device != device:
+                continue
+            if endpoint is not None and key_endpoint != endpoint:
+                continue
+            if name is not None:
+                if key_name is None:
+                    continue
+                if not (key_name.startswith(name) if prefix else key_name == name):
+                    continue
+            del self._digests[key]
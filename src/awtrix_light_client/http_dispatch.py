@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping
+
+URGENT = 0
+NORMAL = 1
+BACKGROUND = 2
+
+PRIORITIES = {
+    "notify": URGENT,
+    "notify/dismiss": URGENT,
+    "indicator1": URGENT,
+    "indicator2": URGENT,
+    "indicator3": URGENT,
+    "custom": BACKGROUND,
+    "stats": BACKGROUND,
+    "screen": BACKGROUND,
+}
+"""Priority of the endpoints scheduled by `PriorityDispatcher`, lower is sent first, others are `NORMAL`"""
+
+
+class DeviceDispatcher:
+    def __init__(self, max_in_flight: int = 1) -> None:
+        """
+        Queue of the requests sent to a device, at most `max_in_flight` are sent at the same time and the others are sent in
+        arrival order. A freed slot is handed to the oldest waiting request, a request arriving later can't overtake it.
+        The web server of the device handles about one request at a time, 1 gives the best throughput without timeouts.
+        Share a dispatcher between the clients of a same device, each device should have its own so devices are called in parallel.
+        :param max_in_flight: Maximum number of requests sent to the device at the same time
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than 0")
+
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :return: Number of requests being sent
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """
+        :return: Number of requests waiting for a slot
+        """
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    def _enqueue(self, waiter: asyncio.Future, endpoint: str | None) -> None:
+        self._waiters.append(waiter)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        return self._waiters.popleft() if self._waiters else None
+
+    async def acquire(self, endpoint: str | None = None) -> None:
+        """
+        Wait until the request may be sent, `release` must be called once it completes
+        :param endpoint: Endpoint of the request
+        """
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._enqueue(waiter, endpoint)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over right before the cancellation
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+    def release(self) -> None:
+        """
+        Free the slot of a completed request, it is handed to the next waiting request
+        """
+        while (waiter := self._next_waiter()) is not None:
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str | None = None) -> AsyncIterator[None]:
+        """
+        Hold a slot while the request is sent
+        :param endpoint: Endpoint of the request
+        """
+        await self.acquire(endpoint)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class PriorityDispatcher(DeviceDispatcher):
+    def __init__(
+        self,
+        max_in_flight: int = 1,
+        priorities: Mapping[str, int] = PRIORITIES,
+        aging: float = 1.0,
+    ) -> None:
+        """
+        Queue of the requests sent to a device where urgent requests (notifications, indicators) overtake the background ones
+        (custom applications refreshes, stats and screen polls), requests of the same priority are sent in arrival order.
+        A waiting request gains one priority level every `aging` seconds so background requests are never starved: a request
+        is only overtaken by a later one more urgent by more levels than the time between their arrivals divided by `aging`.
+        :param max_in_flight: Maximum number of requests sent to the device at the same time
+        :param priorities: Priority of the endpoints, lower is sent first, endpoints missing are `NORMAL`
+        :param aging: Time in seconds after which a waiting request gains one priority level
+        """
+        if aging <= 0:
+            raise ValueError("aging must be greater than 0")
+
+        super().__init__(max_in_flight)
+        self.priorities = dict(priorities)
+        self.aging = aging
+        self._waiters: list[tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(not waiter.done() for _, _, waiter in self._waiters)
+
+    def _enqueue(self, waiter: asyncio.Future, endpoint: str | None) -> None:
+        priority = self.priorities.get(endpoint, NORMAL)
+        # the effective priority `priority - waited / aging` of the waiting requests all decrease at the same pace,
+        # ordering by `priority * aging + enqueued_at` gives the same order without updating them
+        heapq.heappush(
+            self._waiters,
+            (priority * self.aging + time.monotonic(), next(self._sequence), waiter),
+        )
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        self._waiters = [entry for entry in self._waiters if entry[2] is not waiter]
+        heapq.heapify(self._waiters)
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        return heapq.heappop(self._waiters)[2] if self._waiters else None
@@ -0,0 +1,217 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds in seconds of the latency and serialization time histograms"""
+
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+"""Upper bounds in bytes of the request and response size histograms"""
+
+
+class Histogram:
+    """Count of observed values per bucket, the last bucket holds values above every bound
+
+    :param bounds: Sorted upper bounds of the buckets
+    """
+
+    __slots__ = ("bounds", "count", "counts", "total")
+
+    def __init__(self, bounds: Iterable[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        :param value: Value to record
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Add the values recorded by another histogram with the same bounds
+        :param other: Histogram to add
+        """
+        if other.bounds != self.bounds:
+            raise ValueError("histograms must have the same bounds")
+
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float | None:
+        """
+        :return: Mean of the recorded values, None if nothing was recorded
+        """
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """
+        :param q: Quantile between 0 and 1
+        :return: Upper bound of the bucket holding the quantile, infinity for the last bucket, None if nothing was recorded
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class RequestMetrics:
+    """Metrics of the requests sent to an endpoint of a device, each retry counts as a request
+
+    :param requests: Number of requests sent
+    :param errors: Number of requests which failed, transport errors and HTTP error statuses
+    :param latency: Time in seconds between sending the request and reading the whole response
+    :param serialization: Time in seconds spent encoding the request body
+    :param request_size: Size in bytes of the request bodies
+    :param response_size: Size in bytes of the response bodies
+    :param throttled: Number of requests delayed by the rate limiter
+    :param dropped: Number of requests dropped by the rate limiter, they are not counted in `requests`
+    :param throttle_wait: Time in seconds the delayed requests waited for the rate limiter
+    """
+
+    requests: int = 0
+    errors: int = 0
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    serialization: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    request_size: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+    response_size: Histogram = field(default_factory=lambda: Histogram(SIZE_BUCKETS))
+    throttled: int = 0
+    dropped: int = 0
+    throttle_wait: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+
+    def merge(self, other: "RequestMetrics") -> None:
+        """
+        :param other: Metrics to add
+        """
+        self.requests += other.requests
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+        self.serialization.merge(other.serialization)
+        self.request_size.merge(other.request_size)
+        self.response_size.merge(other.response_size)
+        self.throttled += other.throttled
+        self.dropped += other.dropped
+        self.throttle_wait.merge(other.throttle_wait)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        """
+        In-memory metrics of the requests sent by the clients, per device and endpoint, and number of requests in flight per device.
+        Clients sharing a registry add up their measures, keyed by their `base_url`.
+        Subclass it and extend `request_started`, `request_finished` and `request_throttled` to forward the measures to another system.
+        """
+        self._requests: dict[tuple[str, str], RequestMetrics] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def request_started(self, device: str, endpoint: str) -> None:
+        """
+        Called when a request is handed to the HTTP client
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        """
+        self._in_flight[device] = self._in_flight.get(device, 0) + 1
+
+    def request_finished(
+        self,
+        device: str,
+        endpoint: str,
+        latency: float,
+        serialization: float,
+        request_size: int,
+        response_size: int,
+        error: bool,
+    ) -> None:
+        """
+        Called when the response is read or the request failed
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        :param latency: Time in seconds between sending the request and reading the whole response
+        :param serialization: Time in seconds spent encoding the request body
+        :param request_size: Size in bytes of the request body
+        :param response_size: Size in bytes of the response body, 0 if no response was received
+        :param error: True if the request failed or the device answered an HTTP error status
+        """
+        self._in_flight[device] -= 1
+
+        metrics = self._metrics(device, endpoint)
+        metrics.requests += 1
+        metrics.errors += error
+        metrics.latency.observe(latency)
+        metrics.serialization.observe(serialization)
+        metrics.request_size.observe(request_size)
+        metrics.response_size.observe(response_size)
+
+    def request_throttled(self, device: str, endpoint: str, wait: float | None) -> None:
+        """
+        Called when the rate limiter delays or drops a request
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        :param wait: Time in seconds the request waits before being sent, None if it is dropped
+        """
+        metrics = self._metrics(device, endpoint)
+        if wait is None:
+            metrics.dropped += 1
+        else:
+            metrics.throttled += 1
+            metrics.throttle_wait.observe(wait)
+
+    def _metrics(self, device: str, endpoint: str) -> RequestMetrics:
+        metrics = self._requests.get((device, endpoint))
+        if metrics is None:
+            metrics = self._requests[(device, endpoint)] = RequestMetrics()
+        return metrics
+
+    def in_flight(self, device: str | None = None) -> int:
+        """
+        :param device: Only count requests of this device, all devices if None
+        :return: Number of requests in flight
+        """
+        if device is None:
+            return sum(self._in_flight.values())
+        return self._in_flight.get(device, 0)
+
+    def get(
+        self, device: str | None = None, endpoint: str | None = None
+    ) -> RequestMetrics:
+        """
+        :param device: Only aggregate requests of this device, all devices if None
+        :param endpoint: Only aggregate requests of this endpoint, all endpoints if None
+        :return: Aggregated metrics of the matching requests
+        """
+        result = RequestMetrics()
+        for (key_device, key_endpoint), metrics in self._requests.items():
+            if device is not None and key_device != device:
+                continue
+            if endpoint is not None and key_endpoint != endpoint:
+                continue
+            result.merge(metrics)
+        return result
+
+    def keys(self) -> list[tuple[str, str]]:
+        """
+        :return: Device and endpoint pairs with recorded requests
+        """
+        return list(self._requests)
+
+    def reset(self) -> None:
+        """
+        Forget the recorded requests, requests in flight are still counted
+        """
+        self._requests.clear()
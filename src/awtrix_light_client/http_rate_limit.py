@@ -0,0 +1,125 @@
+import time
+from typing import Literal, Mapping
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Allow `rate` requests per second on average and bursts of `burst` requests
+        :param rate: Number of tokens added per second
+        :param burst: Maximum number of tokens kept
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst < 1:
+            raise ValueError("burst must be greater than 0")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def tokens(self, now: float) -> float:
+        """
+        :param now: Current `time.monotonic()`
+        :return: Number of tokens available, negative when tokens are reserved by waiting requests
+        """
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def reserve(self, now: float) -> float:
+        """
+        Take a token, even if it is not available yet
+        :param now: Current `time.monotonic()`
+        :return: Time in seconds to wait until the token is available
+        """
+        self._tokens = self.tokens(now) - 1
+        return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, now: float) -> None:
+        """
+        Give back a token reserved by a request which was not sent
+        :param now: Current `time.monotonic()`
+        """
+        self._tokens = min(self.burst, self.tokens(now) + 1)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        endpoints: Mapping[str, tuple[float, int]] | None = None,
+        mode: Literal["wait", "drop"] = "wait",
+    ) -> None:
+        """
+        Token buckets limiting the requests sent to each device, every request takes a token from the bucket of its device
+        and from the bucket of its endpoint if it has its own budget.
+        In "wait" mode requests wait in arrival order for their tokens, in "drop" mode requests without tokens available are rejected.
+        Clients of a same device passed the same limiter draw from one budget per `base_url`.
+        :param rate: Number of requests per second allowed per device
+        :param burst: Number of requests per device allowed at once after an idle period
+        :param endpoints: Rate and burst of the endpoints with their own budget, on top of the device budget
+        :param mode: Wait for a token or drop the request when no token is available
+        """
+        if mode not in ("wait", "drop"):
+            raise ValueError("mode must be wait or drop")
+        # fail early on wrong budgets
+        TokenBucket(rate, burst)
+        for endpoint_rate, endpoint_burst in (endpoints or {}).values():
+            TokenBucket(endpoint_rate, endpoint_burst)
+
+        self.rate = rate
+        self.burst = burst
+        self.endpoints = dict(endpoints or {})
+        self.mode = mode
+        self._buckets: dict[tuple[str, str | None], TokenBucket] = {}
+
+    def _bucket(self, device: str, endpoint: str | None) -> TokenBucket:
+        bucket = self._buckets.get((device, endpoint))
+        if bucket is None:
+            rate, burst = (
+                (self.rate, self.burst)
+                if endpoint is None
+                else self.endpoints[endpoint]
+            )
+            bucket = self._buckets[(device, endpoint)] = TokenBucket(rate, burst)
+        return bucket
+
+    def acquire(self, device: str, endpoint: str) -> float | None:
+        """
+        Take the tokens of a request
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        :return: Time in seconds to wait before sending the request, None if it must be dropped
+        """
+        now = time.monotonic()
+        buckets = [self._bucket(device, None)]
+        if endpoint in self.endpoints:
+            buckets.append(self._bucket(device, endpoint))
+
+        if self.mode == "drop" and any(bucket.tokens(now) < 1 for bucket in buckets):
+            return None
+
+        return max(bucket.reserve(now) for bucket in buckets)
+
+    def refund(self, device: str, endpoint: str) -> None:
+        """
+        Give back the tokens taken by `acquire` for a request which was not sent, e.g. cancelled while waiting
+        :param device: Device identifier
+        :param endpoint: Endpoint of the request
+        """
+        now = time.monotonic()
+        self._bucket(device, None).refund(now)
+        if endpoint in self.endpoints:
+            self._bucket(device, endpoint).refund(now)
+
+    def reset(self, device: str | None = None) -> None:
+        """
+        Refill the buckets
+        :param device: Only refill the buckets of this device, all devices if None
+        """
+        for key in list(self._buckets):
+            if device is None or key[0] == device:
+                del self._buckets[key]
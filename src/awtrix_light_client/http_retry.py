@@ -0,0 +1,152 @@
+import random
+import time
+
+from httpx import ConnectError, ConnectTimeout, PoolTimeout, TransportError
+
+IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        "power",
+        "sleep",
+        "moodlight",
+        "indicator1",
+        "indicator2",
+        "indicator3",
+        "custom",
+        "switch",
+        "settings",
+    }
+)
+"""POST endpoints which can be sent twice without changing the result"""
+
+RETRY_STATUS_CODES = frozenset({500, 502, 503, 504})
+"""HTTP status codes worth retrying"""
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 5.0,
+        idempotent_endpoints: frozenset[str] = IDEMPOTENT_ENDPOINTS,
+        retry_status_codes: frozenset[int] = RETRY_STATUS_CODES,
+    ) -> None:
+        """
+        Exponential backoff with full jitter, GET requests and idempotent endpoints are retried on transport errors and on retryable status codes,
+        other endpoints are only retried when the request never reached the device
+        :param max_retries: Maximum number of retries after the first attempt
+        :param backoff: Base delay in seconds, doubled after each attempt
+        :param max_backoff: Maximum delay in seconds between two attempts
+        :param idempotent_endpoints: POST endpoints safe to send twice
+        :param retry_status_codes: HTTP status codes worth retrying
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries must be positive")
+
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent_endpoints = idempotent_endpoints
+        self.retry_status_codes = retry_status_codes
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        """
+        :param method: HTTP method of the request
+        :param url: Endpoint of the request
+        :return: True if the request can be sent twice without changing the result
+        """
+        return method == "GET" or url in self.idempotent_endpoints
+
+    def should_retry_status(self, method: str, url: str, status_code: int) -> bool:
+        """
+        :param method: HTTP method of the request
+        :param url: Endpoint of the request
+        :param status_code: HTTP status code of the response
+        :return: True if the request should be sent again
+        """
+        return status_code in self.retry_status_codes and self.is_idempotent(
+            method, url
+        )
+
+    def should_retry_error(self, method: str, url: str, error: TransportError) -> bool:
+        """
+        :param method: HTTP method of the request
+        :param url: Endpoint of the request
+        :param error: Error raised while sending the request
+        :return: True if the request should be sent again
+        """
+        if isinstance(error, (ConnectError, ConnectTimeout, PoolTimeout)):
+            return True
+        return self.is_idempotent(method, url)
+
+    def delay(self, attempt: int) -> float:
+        """
+        :param attempt: Number of attempts already made
+        :return: Time in seconds to wait before the next attempt
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0) -> None:
+        """
+        Fail fast while a device is down, after `failure_threshold` consecutive failures the circuit opens
+        and requests are rejected until `recovery_time` is elapsed, then a single trial request is let through
+        :param failure_threshold: Number of consecutive failures opening the circuit
+        :param recovery_time: Time in seconds before a trial request is let through an open circuit
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be greater than 0")
+
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        :return: True if requests are currently rejected
+        """
+        return (
+            self._opened_at is not None
+            and time.monotonic() < self._opened_at + self.recovery_time
+        )
+
+    def retry_after(self) -> float:
+        """
+        :return: Time in seconds before the next trial request is let through
+        """
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_time - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """
+        :return: True if the request can be sent, False if it must fail fast
+        """
+        if self._opened_at is None:
+            return True
+
+        now = time.monotonic()
+        if now < self._opened_at + self.recovery_time:
+            return False
+
+        # let a single trial request through, the others keep failing fast until it completes
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """
+        Close the circuit
+        """
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """
+        Count a failure, open the circuit when the threshold is reached
+        """
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
@@ -1,4 +1,6 @@
-from pydantic import AnyHttpUrl, BaseModel, FilePath
+from typing import Literal
+
+from pydantic import AnyHttpUrl, BaseModel, Field, FilePath
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,17 +11,69 @@ class AwtrixHttpConfig(BaseModel):
     :param username: username when using HTTP basic auth
     :param password: password when using HTTP basic auth
     :param verify: SSL certificates (a.k.a CA bundle) used to verify the identity of requested hosts. Either True (default CA bundle), a path to an SSL certificate file, or False (which will disable verification).
+    :param max_connections: Maximum number of connections opened to the device, no limit if None
+    :param max_keepalive_connections: Maximum number of idle connections kept alive to the device, no limit if None
+    :param keepalive_expiry: Time in seconds an idle connection is kept alive, forever if None
+    :param connect_timeout: Maximum time in seconds to establish a connection, no limit if None
+    :param read_timeout: Maximum time in seconds to receive a chunk of the response, no limit if None
+    :param write_timeout: Maximum time in seconds to send a chunk of the request, no limit if None
+    :param pool_timeout: Maximum time in seconds to wait for a connection from the pool, no limit if None
+    :param max_in_flight: Maximum number of requests sent to the device at the same time, no limit if None
+    :param max_retries: Maximum number of retries of a failed request, 0 disables retries
+    :param retry_backoff: Base delay in seconds between two retries, doubled after each attempt
+    :param circuit_breaker_threshold: Number of consecutive failures after which requests fail fast, disabled if None
+    :param circuit_breaker_recovery_time: Time in seconds requests fail fast before a trial request is let through
+    :param response_cache: Cache the effects, transitions, settings and loop responses with the default `ResponseCache` time to live
+    :param single_flight: Concurrent GET requests of the same endpoint share a single request to the device
+    :param rate_limit: Maximum number of requests per second sent to the device, no limit if None
+    :param rate_limit_burst: Number of requests sent at once after an idle period when `rate_limit` is set
+    :param rate_limit_endpoints: Rate and burst of the endpoints with their own budget when `rate_limit` is set
+    :param rate_limit_mode: Wait for the rate limit or drop the request with `AwtrixLightRateLimitedError`
+    :param priority_aging: Send notifications and indicators before the other requests, custom applications and polls last, a waiting request gains a priority level every `priority_aging` seconds. Disabled if None, `max_in_flight` defaults to 1 when enabled
     """
 
     base_url: AnyHttpUrl
     username: str | None = None
     password: str | None = None
     verify_ssl: bool | FilePath = False
+    max_connections: int | None = Field(default=100, ge=1)
+    max_keepalive_connections: int | None = Field(default=20, ge=0)
+    keepalive_expiry: float | None = Field(default=5.0, ge=0)
+    connect_timeout: float | None = Field(default=5.0, gt=0)
+    read_timeout: float | None = Field(default=5.0, gt=0)
+    write_timeout: float | None = Field(default=5.0, gt=0)
+    pool_timeout: float | None = Field(default=5.0, gt=0)
+    max_in_flight: int | None = Field(default=None, ge=1)
+    max_retries: int = Field(default=0, ge=0)
+    retry_backoff: float = Field(default=0.1, ge=0)
+    circuit_breaker_threshold: int | None = Field(default=None, ge=1)
+    circuit_breaker_recovery_time: float = Field(default=30.0, ge=0)
+    response_cache: bool = False
+    single_flight: bool = False
+    rate_limit: float | None = Field(default=None, gt=0)
+    rate_limit_burst: int = Field(default=1, ge=1)
+    rate_limit_endpoints: dict[str, tuple[float, int]] = {}
+    rate_limit_mode: Literal["wait", "drop"] = "wait"
+    priority_aging: float | None = Field(default=None, gt=0)
 
 
 class AwtrixLightHttpClientSettings(BaseSettings):
     awtrix: AwtrixHttpConfig
 
     model_config = SettingsConfigDict(
-        env_prefix="AWTRIX_HTTP_CLIENT_", env_file=".env", env_file_encoding="utf-8"
+        env_prefix="AWTRIX_HTTP_CLIENT_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class AwtrixLightFleetClientSettings(BaseSettings):
+    devices: dict[str, AwtrixHttpConfig]
+
+    model_config = SettingsConfigDict(
+        env_prefix="AWTRIX_HTTP_CLIENT_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
     )
@@ -0,0 +1,73 @@
+import json
+from typing import Any, Protocol
+
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec(Protocol):
+    """Encode request bodies and decode response bodies"""
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        :param obj: Object to encode
+        :return: Compact JSON, without whitespace
+        """
+        ...
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        :param data: JSON document
+        :return: Decoded object
+        """
+        ...
+
+
+class StdlibJsonCodec:
+    """Codec based on the `json` module of the standard library"""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode()
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class PydanticJsonCodec:
+    """Codec based on `pydantic_core`, always available"""
+
+    def dumps(self, obj: Any) -> bytes:
+        return pydantic_core.to_json(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        return pydantic_core.from_json(data)
+
+
+class OrjsonJsonCodec:
+    """Codec based on `orjson`, which must be installed"""
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+
+def get_default_codec() -> JsonCodec:
+    """Helper function to get the fastest codec available
+
+    :return: `OrjsonJsonCodec` if orjson is installed, `PydanticJsonCodec` otherwise
+    """
+    if orjson is not None:
+        return OrjsonJsonCodec()
+    return PydanticJsonCodec()
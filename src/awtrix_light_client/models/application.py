@@ -1,12 +1,25 @@
+from array import array
 from enum import IntEnum
-
-from pydantic import BaseModel, Field, field_serializer, model_validator
+from typing import Any, Generic, Iterable, TypeVar
+
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainSerializer,
+    PlainValidator,
+    TypeAdapter,
+    WrapSerializer,
+    field_serializer,
+    model_validator,
+)
 from pydantic.networks import Annotated, UrlConstraints
 from pydantic_core import Url
 from pydantic_extra_types.color import Color
+from typing_extensions import TypedDict
 
+from .draw import DrawList
 from .effect import EffectSetting, EffectType
-from .utils import convert_color_to_hex
+from .utils import UINT32_TYPECODE, PackedColor, convert_color_to_hex, pack_rgb888
 
 
 class TextCase(IntEnum):
@@ -46,13 +59,13 @@ class Dp(BaseModel):
 
     x: int
     y: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -71,13 +84,13 @@ class Dl(BaseModel):
     y0: int
     x1: int
     y1: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -96,13 +109,13 @@ class Dr(BaseModel):
     y: int
     w: int
     h: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -121,13 +134,13 @@ class Df(BaseModel):
     y: int
     w: int
     h: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -144,13 +157,13 @@ class Dc(BaseModel):
     x: int
     y: int
     r: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -167,13 +180,13 @@ class Dfc(BaseModel):
     x: int
     y: int
     r: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -190,34 +203,51 @@ class Dt(BaseModel):
     x: int
     y: int
     t: int
-    cl: Color
+    cl: Color | PackedColor
 
     @field_serializer(
         "cl",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
 
 
+def _validate_bitmap(value: Any) -> array:
+    if isinstance(value, array) and value.typecode in "hHiIlLqQ":
+        # already packed 24 bit colors
+        if value.typecode == UINT32_TYPECODE:
+            return value
+        return array(UINT32_TYPECODE, value)
+    if isinstance(value, (bytes, bytearray, memoryview, array)):
+        return pack_rgb888(value)
+    raise ValueError("bitmap must be a RGB888 buffer or an array of 24 bit colors")
+
+
+PackedBitmap = Annotated[
+    Any,
+    PlainValidator(_validate_bitmap),
+    PlainSerializer(lambda v: v.tolist(), return_type=list[int]),
+]
+"""Bitmap given as a buffer: RGB888 bytes (bytes, bytearray, memoryview, array of bytes) or an array of 32 bit 0xRRGGBB colors"""
+
+
 class Db(BaseModel):
     """Draws a RGB888 bitmap array
     :param x: Top left corner pixel x axis
     :param y: Top left corner pixel y axis
     :param w: Width
     :param h: High
-    :param bmp: Bitmap array
+    :param bmp: Bitmap array, as a list or as a buffer serialized to 24 bit colors without a Python object per pixel
     """
 
     x: int
     y: int
     w: int
     h: int
-    bmp: list[str]
-
-    # bmp: Union[bytes, bytearray, memoryview] need to generate pydantic schema, leaving it for now
+    bmp: list[str] | list[int] | PackedBitmap
 
 
 class LifeTimeMode(IntEnum):
@@ -237,13 +267,13 @@ class Fragment(BaseModel):
     """
 
     t: str
-    c: Color
+    c: Color | PackedColor
 
     @field_serializer(
         "c",
     )
-    def convert_color_to_int(v: Color) -> str:
-        if v:
+    def convert_color_to_int(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         else:
             return v
@@ -273,7 +303,7 @@ class BaseApplication(BaseModel):
     :param progress: Shows a progress bar. Value can be 0-100.
     :param progressC: The color of the progress bar.
     :param progressBC: The color of the progress bar background.
-    :param draw: Array of drawing instructions. Each object represents a drawing command. See the drawing instructions below.
+    :param draw: Array of drawing instructions. Each object represents a drawing command. See the drawing instructions below. A `DrawList` can be given instead.
     :param noScroll: Disables the text scrolling.
     :param scrollSpeed: Modifies the scroll speed. Enter a percentage value of the original scroll speed.
     :param effect: Shows an effect as background.The effect can be removed by sending an empty string for effect.
@@ -285,11 +315,13 @@ class BaseApplication(BaseModel):
     topText: bool | None = None
     textOffset: int | None = Field(default=None, ge=0)
     center: bool | None = None
-    color: Color | None = None
-    gradient: list[Color] | None = Field(default=None, min_length=2, max_length=2)
+    color: Color | PackedColor | None = None
+    gradient: list[Color | PackedColor] | None = Field(
+        default=None, min_length=2, max_length=2
+    )
     blinkText: int | None = None
     fadeText: int | None = None
-    background: Color | None = None
+    background: Color | PackedColor | None = None
     rainbow: bool | None = None
     icon: str | None = None
     pushIcon: PushIcon | None = None
@@ -299,9 +331,9 @@ class BaseApplication(BaseModel):
     line: list[int] | None = Field(default=None, max_length=16)
     autoscale: bool | None = None
     progress: int | None = Field(default=None, ge=-1, le=100)
-    progressC: Color | None = None
-    progressBC: Color | None = None
-    draw: list[Dp | Dl | Dr | Df | Dc | Dfc | Dt | Db] | None = None
+    progressC: Color | PackedColor | None = None
+    progressBC: Color | PackedColor | None = None
+    draw: DrawList | list[Dp | Dl | Dr | Df | Dc | Dfc | Dt | Db] | None = None
     noScroll: bool | None = None
     scrollSpeed: int | None = Field(default=None, ge=0, le=100)
     effect: EffectType | None = None
@@ -339,11 +371,20 @@ class BaseApplication(BaseModel):
         return self
 
     @field_serializer("color", "gradient", "background", "progressC", "progressBC")
-    def convert_color_to_hex(v: list[Color] | Color) -> list | str:
+    def convert_color_to_hex(v: list[Color | int] | Color | int | None) -> list | str:
         if isinstance(v, list):
             return [convert_color_to_hex(color) for color in v]
-        else:
+        elif v is not None:
             return convert_color_to_hex(v)
+        else:
+            return v
+
+    def compile(self) -> "CompiledApplication":
+        """
+        Serialize the application once, the result can be sent any number of times without being serialized again
+        :return: Return a `CompiledApplication` object
+        """
+        return CompiledApplication(self)
 
 
 class CustomApplication(BaseApplication):
@@ -395,3 +436,152 @@ class Notification(BaseApplication):
     @field_serializer("clients")
     def convert_url_to_str(clients: list[CLIENT_TYPE]) -> list[str]:
         return [str(client) for client in clients]
+
+
+T = TypeVar("T", bound=BaseApplication)
+
+
+class CompiledApplication(Generic[T]):
+    """Immutable snapshot of an application along with its encoded JSON payload, to send the same application many times
+
+    :param application: Application to compile, later changes to it are not reflected
+    """
+
+    __slots__ = ("_application", "_content", "_lifetime", "_model")
+
+    def __init__(self, application: T) -> None:
+        self._model = type(application)
+        self._application: T | None = application.model_copy(deep=True)
+        self._content = application.model_dump_json(exclude_none=True).encode()
+        self._lifetime = getattr(application, "lifetime", None)
+
+    @classmethod
+    def _from_content(
+        cls, model: type[T], content: bytes, lifetime: int | None
+    ) -> "CompiledApplication[T]":
+        compiled = cls.__new__(cls)
+        compiled._model = model
+        compiled._application = None
+        compiled._content = content
+        compiled._lifetime = lifetime
+        return compiled
+
+    @property
+    def application(self) -> T:
+        """
+        :return: Copy of the compiled application
+        """
+        if self._application is None:
+            # rendered from a template, only built when asked for
+            self._application = self._model.model_validate_json(self._content)
+        return self._application.model_copy(deep=True)
+
+    @property
+    def lifetime(self) -> int | None:
+        """
+        :return: Lifetime of the compiled custom application if any
+        """
+        return self._lifetime
+
+    @property
+    def content(self) -> bytes:
+        """
+        :return: Encoded JSON payload
+        """
+        return self._content
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompiledApplication):
+            return self._content == other._content
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._content)
+
+    def __repr__(self) -> str:
+        return f"CompiledApplication({self._content!r})"
+
+
+def _field_type(model: type[BaseModel], name: str) -> Any:
+    # validated and serialized the way the model does, field serializers included
+    field = model.model_fields[name]
+    metadata: list[Any] = [field]
+    for decorator in model.__pydantic_decorators__.field_serializers.values():
+        if name in decorator.info.fields:
+            serializer = (
+                PlainSerializer if decorator.info.mode == "plain" else WrapSerializer
+            )
+            metadata.append(
+                serializer(decorator.func, when_used=decorator.info.when_used)
+            )
+    return Annotated[(field.annotation, *metadata)]
+
+
+class ApplicationTemplate(Generic[T]):
+    """Application whose static part is validated and serialized once, only the variable fields are validated and serialized on each render.
+    Model validators checking several fields together are run on the template only, not on the variable values.
+
+    :param application: Application holding the static part, the variable fields are ignored
+    :param fields: Name of the variable fields
+    """
+
+    __slots__ = ("_adapter", "_fields", "_lifetime", "_model", "_prefix")
+
+    def __init__(self, application: T, fields: Iterable[str]) -> None:
+        model = type(application)
+        fields = set(fields)
+        unknown = fields - set(model.model_fields)
+        if unknown:
+            raise ValueError(f"unknown fields {sorted(unknown)}")
+
+        self._model = model
+        self._fields = frozenset(fields)
+        # the variable values are validated and serialized in a single call
+        self._adapter = TypeAdapter(
+            TypedDict(
+                f"{model.__name__}Values",
+                {
+                    name: _field_type(model, name)
+                    for name in model.model_fields
+                    if name in fields
+                },
+                total=False,
+            )
+        )
+        static = application.model_dump_json(exclude_none=True, exclude=fields)
+        # keep the opening brace and the static keys, variable keys are appended on render
+        self._prefix = static[:-1].encode()
+        self._lifetime = (
+            None if "lifetime" in fields else getattr(application, "lifetime", None)
+        )
+
+    @property
+    def fields(self) -> list[str]:
+        """
+        :return: Name of the variable fields
+        """
+        return sorted(self._fields)
+
+    def render(self, **values: Any) -> CompiledApplication[T]:
+        """
+        Validate the variable values and splice them into the serialized static part
+        :param values: Value of the variable fields, missing ones are left out
+        :return: Return a `CompiledApplication` object ready to be sent
+        """
+        unknown = values.keys() - self._fields
+        if unknown:
+            raise ValueError(f"{min(unknown)} is not a variable field of the template")
+
+        values = self._adapter.validate_python(values)
+        lifetime = values.get("lifetime")
+        if lifetime is None:
+            lifetime = self._lifetime
+
+        variable = self._adapter.dump_json(values, exclude_none=True)
+        if len(variable) == 2:
+            content = self._prefix + b"}"
+        elif len(self._prefix) > 1:
+            content = self._prefix + b"," + variable[1:]
+        else:
+            content = self._prefix + variable[1:]
+        return CompiledApplication._from_content(self._model, content, lifetime)
@@ -0,0 +1,300 @@
+from array import array
+from typing import Any, Callable, Iterable, NamedTuple
+
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+from pydantic_extra_types.color import Color
+
+from .utils import convert_color_to_hex, pack_rgb888
+
+
+class Pixel(NamedTuple):
+    """Draw a pixel, same wire format as `Dp`
+    :param x: Pixel x axis
+    :param y: Pixel y axis
+    :param cl: Pixel color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    cl: Color | int
+
+
+class Line(NamedTuple):
+    """Draw a line, same wire format as `Dl`
+    :param x0: Start pixel x axis
+    :param y0: Start pixel y axis
+    :param x1: End pixel x axis
+    :param y1: End pixel y axis
+    :param cl: Line color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    cl: Color | int
+
+
+class Rectangle(NamedTuple):
+    """Draw a rectangle, same wire format as `Dr`
+    :param x: Top left corner pixel x axis
+    :param y: Top left corner pixel y axis
+    :param w: Width
+    :param h: High
+    :param cl: Line color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    w: int
+    h: int
+    cl: Color | int
+
+
+class FilledRectangle(NamedTuple):
+    """Draw a filled rectangle, same wire format as `Df`
+    :param x: Top left corner pixel x axis
+    :param y: Top left corner pixel y axis
+    :param w: Width
+    :param h: High
+    :param cl: Fill color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    w: int
+    h: int
+    cl: Color | int
+
+
+class Circle(NamedTuple):
+    """Draw a circle, same wire format as `Dc`
+    :param x: Circle center x axis
+    :param y: Circle center y axis
+    :param r: Radius
+    :param cl: Line color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    r: int
+    cl: Color | int
+
+
+class FilledCircle(NamedTuple):
+    """Draw a filled circle, same wire format as `Dfc`
+    :param x: Circle center x axis
+    :param y: Circle center y axis
+    :param r: Radius
+    :param cl: Fill color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    r: int
+    cl: Color | int
+
+
+class Text(NamedTuple):
+    """Draw text, same wire format as `Dt`
+    :param x: Text top left corner pixel x axis
+    :param y: Text top left corner pixel y axis
+    :param t: Text
+    :param cl: Text color, as a `Color` or a 0xRRGGBB integer
+    """
+
+    x: int
+    y: int
+    t: int
+    cl: Color | int
+
+
+class Bitmap(NamedTuple):
+    """Draw a RGB888 bitmap, same wire format as `Db`
+    :param x: Top left corner pixel x axis
+    :param y: Top left corner pixel y axis
+    :param w: Width
+    :param h: High
+    :param bmp: Bitmap as a list, a RGB888 buffer or an array of 24 bit colors
+    """
+
+    x: int
+    y: int
+    w: int
+    h: int
+    bmp: Any
+
+
+DrawPrimitive = (
+    Pixel | Line | Rectangle | FilledRectangle | Circle | FilledCircle | Text | Bitmap
+)
+
+
+def _bitmap_to_wire(bmp: Any) -> list:
+    if isinstance(bmp, list):
+        return bmp
+    if isinstance(bmp, array) and bmp.typecode in "hHiIlLqQ":
+        return bmp.tolist()
+    return pack_rgb888(bmp).tolist()
+
+
+_hex = convert_color_to_hex
+
+# one literal per primitive, much faster than building the dicts from `_fields`
+_ENCODERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    Pixel: lambda p: {"x": p[0], "y": p[1], "cl": _hex(p[2])},
+    Line: lambda p: {"x0": p[0], "y0": p[1], "x1": p[2], "y1": p[3], "cl": _hex(p[4])},
+    Rectangle: lambda p: {"x": p[0], "y": p[1], "w": p[2], "h": p[3], "cl": _hex(p[4])},
+    FilledRectangle: lambda p: {
+        "x": p[0],
+        "y": p[1],
+        "w": p[2],
+        "h": p[3],
+        "cl": _hex(p[4]),
+    },
+    Circle: lambda p: {"x": p[0], "y": p[1], "r": p[2], "cl": _hex(p[3])},
+    FilledCircle: lambda p: {"x": p[0], "y": p[1], "r": p[2], "cl": _hex(p[3])},
+    Text: lambda p: {"x": p[0], "y": p[1], "t": p[2], "cl": _hex(p[3])},
+    Bitmap: lambda p: {
+        "x": p[0],
+        "y": p[1],
+        "w": p[2],
+        "h": p[3],
+        "bmp": _bitmap_to_wire(p[4]),
+    },
+}
+
+
+class DrawList:
+    """Drawing instructions kept as plain tuples, without a model instance nor validation per instruction.
+    The whole list is serialized in one pass and is accepted by `BaseApplication.draw` in place of a list of models.
+    Coordinates and colors are sent as given, they are not validated
+
+    :param primitives: Initial drawing instructions
+    """
+
+    __slots__ = ("_primitives",)
+
+    def __init__(self, primitives: Iterable[DrawPrimitive] = ()) -> None:
+        self._primitives: list[DrawPrimitive] = list(primitives)
+
+    def append(self, primitive: DrawPrimitive) -> "DrawList":
+        """
+        :param primitive: Drawing instruction to add
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(primitive)
+        return self
+
+    def extend(self, primitives: Iterable[DrawPrimitive]) -> "DrawList":
+        """
+        :param primitives: Drawing instructions to add
+        :return: The draw list, to chain calls
+        """
+        self._primitives.extend(primitives)
+        return self
+
+    def pixel(self, x: int, y: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `Pixel`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Pixel(x, y, cl))
+        return self
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `Line`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Line(x0, y0, x1, y1, cl))
+        return self
+
+    def rectangle(self, x: int, y: int, w: int, h: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `Rectangle`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Rectangle(x, y, w, h, cl))
+        return self
+
+    def filled_rectangle(
+        self, x: int, y: int, w: int, h: int, cl: Color | int
+    ) -> "DrawList":
+        """
+        Add a `FilledRectangle`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(FilledRectangle(x, y, w, h, cl))
+        return self
+
+    def circle(self, x: int, y: int, r: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `Circle`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Circle(x, y, r, cl))
+        return self
+
+    def filled_circle(self, x: int, y: int, r: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `FilledCircle`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(FilledCircle(x, y, r, cl))
+        return self
+
+    def text(self, x: int, y: int, t: int, cl: Color | int) -> "DrawList":
+        """
+        Add a `Text`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Text(x, y, t, cl))
+        return self
+
+    def bitmap(self, x: int, y: int, w: int, h: int, bmp: Any) -> "DrawList":
+        """
+        Add a `Bitmap`
+        :return: The draw list, to chain calls
+        """
+        self._primitives.append(Bitmap(x, y, w, h, bmp))
+        return self
+
+    def to_wire(self) -> list[dict[str, Any]]:
+        """
+        :return: The drawing instructions in the format sent to the device
+        """
+        return [_ENCODERS[type(primitive)](primitive) for primitive in self._primitives]
+
+    @classmethod
+    def _validate(cls, value: Any) -> "DrawList":
+        if not isinstance(value, cls):
+            raise ValueError("draw list must be a DrawList")
+        return value
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda v: v.to_wire(),
+                return_schema=core_schema.list_schema(core_schema.dict_schema()),
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._primitives)
+
+    def __iter__(self):
+        return iter(self._primitives)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, DrawList):
+            return self._primitives == other._primitives
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"DrawList({self._primitives!r})"
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, field_serializer, model_validator
 from pydantic_extra_types.color import Color
 
-from .utils import convert_color_to_hex
+from .utils import PackedColor, convert_color_to_hex
 
 
 class Moodlight(BaseModel):
@@ -13,7 +13,7 @@ class Moodlight(BaseModel):
 
     brightness: int | None = None
     kelvin: int | None = None
-    color: Color | None = None
+    color: Color | PackedColor | None = None
 
     @model_validator(mode="after")
     def check_constraint_blink_text(self) -> "Moodlight":
@@ -22,7 +22,7 @@ class Moodlight(BaseModel):
         return self
 
     @field_serializer("color")
-    def convert_color_to_hex(v: Color) -> str:
-        if v:
+    def convert_color_to_hex(v: Color | int) -> str:
+        if v is not None:
             return convert_color_to_hex(v)
         return v
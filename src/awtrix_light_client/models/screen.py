@@ -1,5 +1,22 @@
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Iterable
+
 from pydantic import BaseModel, Field
 
+from ..json_codec import JsonCodec, get_default_codec
+from .utils import UINT32_TYPECODE
+
+SCREEN_WIDTH = 32
+SCREEN_HEIGHT = 8
+SCREEN_SIZE = SCREEN_WIDTH * SCREEN_HEIGHT
+
+# offset of the red, green and blue bytes inside a native 32 bit 0x00RRGGBB pixel
+_CHANNEL_OFFSETS = (2, 1, 0) if sys.byteorder == "little" else (1, 2, 3)
+
+_CODEC = get_default_codec()
+
 
 class Screen(BaseModel):
     """Screen
@@ -7,3 +24,221 @@ class Screen(BaseModel):
     """
 
     matrix: list[int] = Field(min_length=256, max_length=256)
+
+
+@dataclass(frozen=True)
+class ScreenDiff:
+    """Pixels changed between two screens
+
+    :param changed: Index of the changed pixels, row by row
+    :param rectangles: Bounding rectangles (x, y, w, h) of the changes, one per band of consecutive changed rows
+    :param ratio: Share of the screen which changed, between 0 and 1
+    """
+
+    changed: tuple[int, ...] = ()
+    rectangles: tuple[tuple[int, int, int, int], ...] = ()
+    ratio: float = 0.0
+
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+
+class PackedScreen:
+    """Compact screen backed by an `array` of 32 bit integers instead of a list of Python ints.
+    Rows, columns and color channels are exposed as zero-copy `memoryview`
+
+    :param pixels: 256 colors in 0xRRGGBB format, row by row, as an iterable of ints, an `array` or native endian 32 bit integers bytes
+    """
+
+    __slots__ = ("_pixels", "_view")
+
+    def __init__(self, pixels: Iterable[int] | array | bytes | bytearray | memoryview):
+        if isinstance(pixels, array) and pixels.typecode == UINT32_TYPECODE:
+            packed = pixels
+        elif isinstance(pixels, (bytes, bytearray, memoryview)):
+            packed = array(UINT32_TYPECODE)
+            packed.frombytes(pixels)
+        else:
+            packed = array(UINT32_TYPECODE, pixels)
+
+        if len(packed) != SCREEN_SIZE:
+            raise ValueError(f"screen must have {SCREEN_SIZE} pixels")
+
+        self._pixels = packed
+        self._view = memoryview(packed).toreadonly()
+
+    @classmethod
+    def _from_array(cls, packed: array) -> "PackedScreen":
+        if len(packed) != SCREEN_SIZE:
+            raise ValueError(f"screen must have {SCREEN_SIZE} pixels")
+
+        screen = cls.__new__(cls)
+        screen._pixels = packed
+        screen._view = memoryview(packed).toreadonly()
+        return screen
+
+    @classmethod
+    def from_screen(cls, screen: Screen) -> "PackedScreen":
+        """
+        :param screen: `Screen` to pack
+        :return: Return a `PackedScreen` object
+        """
+        return cls(screen.matrix)
+
+    @classmethod
+    def from_json(
+        cls, content: bytes | str, codec: JsonCodec | None = None
+    ) -> "PackedScreen":
+        """
+        Build a screen from the JSON body returned by the screen endpoint, parsed straight into the array
+        :param content: JSON array of 256 colors
+        :param codec: Codec parsing the body, the fastest one installed if None
+        :return: Return a `PackedScreen` object
+        """
+        return cls._from_array(array(UINT32_TYPECODE, (codec or _CODEC).loads(content)))
+
+    def to_screen(self) -> Screen:
+        """
+        :return: Return the screen as a `Screen` object
+        """
+        return Screen.model_construct(matrix=self._pixels.tolist())
+
+    @property
+    def pixels(self) -> memoryview:
+        """
+        :return: Read-only view over the 256 colors, row by row
+        """
+        return self._view
+
+    def pixel(self, x: int, y: int) -> int:
+        """
+        :param x: Pixel x axis
+        :param y: Pixel y axis
+        :return: Color of the pixel in 0xRRGGBB format
+        """
+        if not (0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT):
+            raise IndexError("pixel out of the screen")
+        return self._pixels[y * SCREEN_WIDTH + x]
+
+    def row(self, y: int) -> memoryview:
+        """
+        :param y: Row index
+        :return: Read-only view over the 32 colors of the row
+        """
+        if not 0 <= y < SCREEN_HEIGHT:
+            raise IndexError("row out of the screen")
+        return self._view[y * SCREEN_WIDTH : (y + 1) * SCREEN_WIDTH]
+
+    def column(self, x: int) -> memoryview:
+        """
+        :param x: Column index
+        :return: Read-only view over the 8 colors of the column
+        """
+        if not 0 <= x < SCREEN_WIDTH:
+            raise IndexError("column out of the screen")
+        return self._view[x::SCREEN_WIDTH]
+
+    def channels(self) -> tuple[memoryview, memoryview, memoryview]:
+        """
+        :return: Read-only views over the red, green and blue bytes of the 256 pixels
+        """
+        raw = self._view.cast("B")
+        return tuple(raw[offset::4] for offset in _CHANNEL_OFFSETS)
+
+    def diff(self, other: "PackedScreen") -> ScreenDiff:
+        """
+        Compare with another screen, rows are compared as raw bytes and changed pixels of a row are found
+        with integer bit operations, so the cost grows with the number of changed pixels only
+        :param other: Screen to compare to
+        :return: Return a `ScreenDiff` object
+        """
+        before = self._pixels.tobytes()
+        after = other._pixels.tobytes()
+        if before == after:
+            return ScreenDiff()
+
+        row_size = SCREEN_WIDTH * 4
+        changed = []
+        rectangles = []
+        band = None
+
+        for y in range(SCREEN_HEIGHT):
+            start = y * row_size
+            # pixel i of the row lands on bits [32 * i, 32 * i + 32) whatever the native byte order
+            bits = int.from_bytes(
+                before[start : start + row_size], "little"
+            ) ^ int.from_bytes(after[start : start + row_size], "little")
+
+            if not bits:
+                if band is not None:
+                    rectangles.append(band)
+                    band = None
+                continue
+
+            first = None
+            while bits:
+                x = ((bits & -bits).bit_length() - 1) >> 5
+                changed.append(y * SCREEN_WIDTH + x)
+                bits &= ~((1 << ((x + 1) * 32)) - 1)
+                if first is None:
+                    first = x
+            last = x
+
+            if band is None:
+                band = (first, y, last - first + 1, 1)
+            else:
+                left = min(band[0], first)
+                right = max(band[0] + band[2] - 1, last)
+                band = (left, band[1], right - left + 1, band[3] + 1)
+
+        if band is not None:
+            rectangles.append(band)
+
+        return ScreenDiff(
+            changed=tuple(changed),
+            rectangles=tuple(rectangles),
+            ratio=len(changed) / SCREEN_SIZE,
+        )
+
+    def tobytes(self) -> bytes:
+        """
+        :return: The 256 colors as native endian 32 bit integers
+        """
+        return self._pixels.tobytes()
+
+    def __len__(self) -> int:
+        return SCREEN_SIZE
+
+    def __getitem__(self, index: int) -> int:
+        return self._pixels[index]
+
+    def __iter__(self):
+        return iter(self._pixels)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PackedScreen):
+            return self._pixels == other._pixels
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._pixels.tobytes())
+
+    def __repr__(self) -> str:
+        return f"PackedScreen({self._pixels.tolist()!r})"
+
+
+def diff_screens(
+    previous: Screen | PackedScreen, current: Screen | PackedScreen
+) -> ScreenDiff:
+    """Helper function to compare two screens
+
+    :param previous: Previous screen
+    :param current: Current screen
+    :return: Return a `ScreenDiff` object
+    """
+    if isinstance(previous, Screen):
+        previous = PackedScreen.from_screen(previous)
+    if isinstance(current, Screen):
+        current = PackedScreen.from_screen(current)
+
+    return previous.diff(current)
@@ -4,7 +4,7 @@ from pydantic import BaseModel, Field, field_serializer, field_validator
 from pydantic_extra_types.color import Color
 
 from .transition import TransitionType
-from .utils import convert_color_to_hex
+from .utils import convert_color_to_hex, convert_color_to_int
 
 
 class Settings(BaseModel):
@@ -150,6 +150,6 @@ class Settings(BaseModel):
     )
     def convert_color_to_int(v: Any) -> int:
         if isinstance(v, Color):
-            return int(v.as_hex(format="long")[1:], 16)
+            return convert_color_to_int(v)
         else:
             return v
@@ -1,10 +1,87 @@
+import sys
+from array import array
+from functools import lru_cache
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, Field
 from pydantic_extra_types.color import Color
 
+# typecode of an unsigned 32 bit integer on this platform
+UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+
+
+def _reject_bool(value: Any) -> Any:
+    if isinstance(value, bool):
+        raise ValueError("a packed color can't be a boolean")
+    return value
+
+
+PackedColor = Annotated[int, BeforeValidator(_reject_bool), Field(ge=0, le=0xFFFFFF)]
+"""Color already packed as a 24 bit 0xRRGGBB integer, serialized without building a `Color`"""
+
+# a draw list reuses a handful of colors, keep their wire formats around
+_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _packed_to_hex(color: int) -> str:
+    return f"#{color:06X}"
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _rgba_to_hex(r: float, g: float, b: float, alpha: float | None) -> str:
+    # same output as Color.as_hex(format="long").upper()
+    channels = (r, g, b) if alpha is None else (r, g, b, alpha)
+    return "#" + "".join(f"{round(c * 255):02X}" for c in channels)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _rgba_to_int(r: float, g: float, b: float, alpha: float | None) -> int:
+    return int(_rgba_to_hex(r, g, b, alpha)[1:], 16)
 
-def convert_color_to_hex(color: Color) -> str:
-    """Helper function to convert a color in hex format
 
-    :param color: color to convert
+def convert_color_to_hex(color: Color | int) -> str:
+    """Helper function to convert a color in hex format, conversions are memoized
+
+    :param color: color to convert, or a color packed as a 24 bit integer
     :return: color in hex format
     """
-    return color.as_hex(format="long").upper()
+    if isinstance(color, int):
+        return _packed_to_hex(color)
+    rgba = color._rgba
+    return _rgba_to_hex(rgba.r, rgba.g, rgba.b, rgba.alpha)
+
+
+def convert_color_to_int(color: Color | int) -> int:
+    """Helper function to convert a color to an integer, conversions are memoized
+
+    :param color: color to convert, or a color already packed as a 24 bit integer
+    :return: color as a 0xRRGGBB integer
+    """
+    if isinstance(color, int):
+        return color
+    rgba = color._rgba
+    return _rgba_to_int(rgba.r, rgba.g, rgba.b, rgba.alpha)
+
+
+def pack_rgb888(buffer: Any) -> array:
+    """Helper function to pack a RGB888 buffer into 24 bit colors, without a Python loop per pixel
+
+    :param buffer: Object supporting the buffer protocol (bytes, bytearray, memoryview, array) holding 3 bytes (red, green, blue) per pixel
+    :return: `array` of colors in 0xRRGGBB format
+    """
+    raw = memoryview(buffer).cast("B").tobytes()
+    if len(raw) % 3:
+        raise ValueError("RGB888 buffer length must be a multiple of 3")
+
+    # lay pixels out as big endian 0x00RRGGBB words, then fix the byte order
+    words = bytearray(len(raw) // 3 * 4)
+    words[1::4] = raw[0::3]
+    words[2::4] = raw[1::3]
+    words[3::4] = raw[2::3]
+
+    packed = array(UINT32_TYPECODE)
+    packed.frombytes(words)
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return packed
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any
+
+from .http_client import AwtrixLightHttpClient
+from .models.setting import Settings
+
+
+def _to_wire(settings: Settings, exclude_unset: bool) -> dict[str, Any]:
+    return settings.model_dump(
+        mode="json", exclude_none=True, exclude_unset=exclude_unset
+    )
+
+
+class SettingsManager:
+    def __init__(self, client: AwtrixLightHttpClient) -> None:
+        """
+        Keep the last known settings of a device to only send the settings which differ, each send is persisted to flash by the device.
+        Fields changed outside the manager, `reset_settings` and `erase` included, are diffed against stale values until `refresh` or `invalidate`.
+        :param client: Client of the device
+        """
+        self._client = client
+        self._known: dict[str, Any] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def known(self) -> Settings | None:
+        """
+        :return: Last known settings of the device, None if they were not fetched yet
+        """
+        if self._known is None:
+            return None
+        return Settings.model_validate(self._known)
+
+    async def refresh(self) -> Settings:
+        """
+        Fetch the settings from the device
+        :return: Return a `Settings` object
+        """
+        async with self._lock:
+            return await self._refresh()
+
+    async def _refresh(self) -> Settings:
+        settings = await self._client.get_settings()
+        self._known = _to_wire(settings, exclude_unset=False)
+        return settings
+
+    def diff(self, settings: Settings) -> dict[str, Any]:
+        """
+        :param settings: Wanted settings, only the fields explicitly set are considered
+        :return: Fields which differ from the last known settings, every set field if they were not fetched yet
+        """
+        wanted = _to_wire(settings, exclude_unset=True)
+        if self._known is None:
+            return wanted
+        return {
+            key: value for key, value in wanted.items() if self._known.get(key) != value
+        }
+
+    async def update(self, settings: Settings) -> dict[str, Any]:
+        """
+        Send the fields explicitly set on `settings` which differ from the device settings, fetched first if unknown.
+        Nothing is sent when every field already has the wanted value
+        :param settings: Wanted settings
+        :return: Fields sent to the device
+        """
+        async with self._lock:
+            if self._known is None:
+                await self._refresh()
+
+            patch = self.diff(settings)
+            if not patch:
+                return patch
+
+            try:
+                await self._client.set_settings(
+                    Settings.model_validate(patch), exclude_unset=True
+                )
+            except BaseException:
+                # the device may or may not have applied the patch, even when the send was cancelled
+                self._known = None
+                raise
+
+            self._known.update(patch)
+            return patch
+
+    def invalidate(self) -> None:
+        """
+        Forget the known settings, they are fetched again on the next update
+        """
+        self._known = None
@@ -1,8 +1,13 @@
-from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, Callable
 
 import pytest
+from httpx import AsyncClient
 
+from awtrix_light_client.fleet_client import (
+    AwtrixLightFleetClient,
+    get_awtrix_fleet_client,
+)
 from awtrix_light_client.http_client import (
     AwtrixLightHttpClient,
     get_awtrix_http_client,
@@ -15,3 +20,58 @@ async def awtrix_http_client(monkeypatch) -> AsyncIterator[AwtrixLightHttpClient
     monkeypatch.setenv("AWTRIX_HTTP_CLIENT_AWTRIX", '{"base_url": "http://test/"}')
     async with get_awtrix_http_client() as client:
         yield client
+
+
+@pytest.fixture
+@asynccontextmanager
+async def awtrix_fleet_client(monkeypatch) -> AsyncIterator[AwtrixLightFleetClient]:
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_DEVICES",
+        '{"kitchen": {"base_url": "http://kitchen/"}, "office": {"base_url": "http://office/"}}',
+    )
+    async with get_awtrix_fleet_client() as client:
+        yield client
+
+
+@pytest.fixture
+def device_stats() -> dict:
+    return {
+        "bat": 52,
+        "bat_raw": 574,
+        "type": 0,
+        "lux": 0,
+        "ldr_raw": 79,
+        "ram": 144524,
+        "bri": 120,
+        "temp": 26,
+        "hum": 45,
+        "uptime": 461,
+        "wifi_signal": -53,
+        "messages": 0,
+        "version": "0.90",
+        "indicator1": False,
+        "indicator2": False,
+        "indicator3": False,
+        "app": "Time",
+        "uid": "awtrix_fa9b04",
+        "matrix": True,
+    }
+
+
+@pytest.fixture
+def base_url() -> str:
+    return "http://test/api/"
+
+
+@pytest.fixture
+def make_awtrix_http_client(
+    base_url: str,
+) -> Callable[..., AbstractAsyncContextManager[AwtrixLightHttpClient]]:
+    @asynccontextmanager
+    async def make(
+        url: str | None = None, **options: Any
+    ) -> AsyncIterator[AwtrixLightHttpClient]:
+        async with AsyncClient(base_url=url or base_url) as http_client:
+            yield AwtrixLightHttpClient(http_client, **options)
+
+    return make
@@ -0,0 +1,75 @@
+from array import array
+
+import pytest
+from pydantic import ValidationError
+from pydantic_extra_types.color import Color
+
+from awtrix_light_client.models.application import (
+    CustomApplication,
+    Db,
+    Dc,
+    Df,
+    Dfc,
+    Dl,
+    Dp,
+    Dr,
+    Dt,
+    Notification,
+)
+from awtrix_light_client.models.draw import DrawList, Pixel, Text
+
+
+async def test_draw_list_matches_models():
+    draw = (
+        DrawList()
+        .pixel(0, 0, Color("#0000FF"))
+        .line(1, 1, 1, 1, 0x0000FF)
+        .rectangle(2, 2, 2, 2, 0x0000FF)
+        .filled_rectangle(3, 3, 3, 3, 0x0000FF)
+        .circle(4, 4, 4, 0x0000FF)
+        .filled_circle(5, 5, 2, 0x0000FF)
+        .text(6, 6, 6, 0x0000FF)
+        .bitmap(7, 7, 1, 1, [255])
+    )
+    models = [
+        Dp(x=0, y=0, cl=Color("#0000FF")),
+        Dl(x0=1, y0=1, x1=1, y1=1, cl=Color("#0000FF")),
+        Dr(x=2, y=2, w=2, h=2, cl=Color("#0000FF")),
+        Df(x=3, y=3, w=3, h=3, cl=Color("#0000FF")),
+        Dc(x=4, y=4, r=4, cl=Color("#0000FF")),
+        Dfc(x=5, y=5, r=2, cl=Color("#0000FF")),
+        Dt(x=6, y=6, t=6, cl=Color("#0000FF")),
+        Db(x=7, y=7, w=1, h=1, bmp=[255]),
+    ]
+
+    assert len(draw) == len(models)
+    assert draw.to_wire() == [model.model_dump() for model in models]
+    assert (
+        CustomApplication(draw=draw).model_dump_json()
+        == CustomApplication(draw=models).model_dump_json()
+    )
+    assert (
+        Notification(text="test", draw=draw).compile().content
+        == Notification(text="test", draw=models).compile().content
+    )
+
+
+async def test_draw_list_bitmap_buffer():
+    draw = DrawList().bitmap(0, 0, 2, 1, b"\xff\x00\x00\x00\x00\xff")
+    draw.bitmap(0, 1, 1, 1, array("I", [0x010203]))
+
+    assert [entry["bmp"] for entry in draw.to_wire()] == [
+        [0xFF0000, 0x0000FF],
+        [0x010203],
+    ]
+
+
+async def test_draw_list_primitives():
+    draw = DrawList([Pixel(0, 0, 1)]).extend([Text(1, 1, 5, 2)]).append(Pixel(2, 2, 3))
+
+    assert list(draw) == [Pixel(0, 0, 1), Text(1, 1, 5, 2), Pixel(2, 2, 3)]
+    assert draw == DrawList(draw)
+    assert draw.to_wire()[1] == {"x": 1, "y": 1, "t": 5, "cl": "#000002"}
+
+    with pytest.raises(ValidationError):
+        CustomApplication(draw="not a draw list")
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+from pydantic_extra_types.color import Color
+
+from awtrix_light_client.draw_compiler import compile_frame, instruction_cost
+from awtrix_light_client.models.application import Db, Df, Dl, Dp
+from awtrix_light_client.models.screen import PackedScreen
+from awtrix_light_client.models.utils import convert_color_to_int
+
+
+def _render(instructions: list, background: int = 0) -> list[int]:
+    frame = [background] * 256
+
+    def color(cl: Color | int) -> int:
+        return convert_color_to_int(cl)
+
+    for instruction in instructions:
+        if isinstance(instruction, Dp):
+            frame[instruction.y * 32 + instruction.x] = color(instruction.cl)
+        elif isinstance(instruction, Dl):
+            for y in range(instruction.y0, instruction.y1 + 1):
+                for x in range(instruction.x0, instruction.x1 + 1):
+                    frame[y * 32 + x] = color(instruction.cl)
+        elif isinstance(instruction, Df):
+            for y in range(instruction.y, instruction.y + instruction.h):
+                for x in range(instruction.x, instruction.x + instruction.w):
+                    frame[y * 32 + x] = color(instruction.cl)
+        elif isinstance(instruction, Db):
+            for j in range(instruction.h):
+                for i in range(instruction.w):
+                    frame[(instruction.y + j) * 32 + instruction.x + i] = (
+                        instruction.bmp[j * instruction.w + i]
+                    )
+    return frame
+
+
+async def test_instruction_cost():
+    pixel = Dp(x=1, y=2, cl=Color("#FF0000"))
+
+    assert instruction_cost(pixel) == len('{"x":1,"y":2,"cl":"#FF0000"},')
+    assert instruction_cost(Dp(x=1, y=2, cl=0xFF0000)) == instruction_cost(pixel)
+    # a run is cheaper as a rectangle than as a line
+    assert instruction_cost(Df(x=10, y=7, w=10, h=1, cl=0)) < instruction_cost(
+        Dl(x0=10, y0=7, x1=19, y1=7, cl=0)
+    )
+    assert instruction_cost({"x": 1}) == len('{"x":1},')
+
+
+async def test_compile_shapes():
+    frame = [0] * 256
+    for y in range(1, 4):
+        for x in range(2, 6):
+            frame[y * 32 + x] = 0xFF0000
+    for x in range(10, 20):
+        frame[7 * 32 + x] = 0x00FF00
+    frame[31] = 0x0000FF
+
+    instructions = compile_frame(PackedScreen(frame))
+
+    assert instructions == [
+        Dp(x=31, y=0, cl=0x0000FF),
+        Df(x=2, y=1, w=4, h=3, cl=0xFF0000),
+        Df(x=10, y=7, w=10, h=1, cl=0x00FF00),
+    ]
+    assert all(type(instruction.cl) is int for instruction in instructions)
+    assert _render(instructions) == frame
+
+
+async def test_compile_noise_to_bitmap():
+    generator = random.Random(42)
+    frame = [generator.randrange(1, 1 << 24) for _ in range(256)]
+
+    instructions = compile_frame(frame)
+
+    assert len(instructions) == 1
+    assert isinstance(instructions[0], Db)
+    assert _render(instructions) == frame
+
+
+async def test_compile_background():
+    assert compile_frame([0] * 256) == []
+    assert _render(compile_frame([7] * 256, background=None)) == [7] * 256
+
+
+async def test_wrong_frame():
+    with pytest.raises(ValueError, match="frame must have 256 pixels"):
+        compile_frame([0] * 10)
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+from pydantic_extra_types.color import Color
+
+from awtrix_light_client.emulator import NATIVE_APPS, AwtrixEmulator
+from awtrix_light_client.http_client import AwtrixLightHttpClientError
+from awtrix_light_client.http_retry import RetryPolicy
+from awtrix_light_client.models.application import CustomApplication, Notification
+from awtrix_light_client.models.loop import Loop
+from awtrix_light_client.models.screen import Screen
+from awtrix_light_client.models.setting import Settings
+from awtrix_light_client.models.transition import TransitionType
+
+
+@pytest.fixture
+async def emulator():
+    async with AwtrixEmulator() as emulator:
+        yield emulator
+
+
+async def test_emulator_state(emulator: AwtrixEmulator, make_awtrix_http_client):
+    async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+        await client.set_custom_application("test", CustomApplication(text="test"))
+        await client.set_custom_application(
+            "multi", [CustomApplication(text="a"), CustomApplication(text="b")]
+        )
+        assert await client.get_loops() == Loop(
+            loops=[*NATIVE_APPS, "test", "multi0", "multi1"]
+        )
+
+        await client.switch_app("multi1")
+        await client.next_app()
+        stats = await client.get_stats()
+        assert stats.app == "Time"
+        assert stats.ram == emulator.free_ram < emulator.ram
+
+        await client.set_indicator(2, color=Color("red"))
+        await client.notify(Notification(text="hello"))
+        stats = await client.get_stats()
+        assert stats.indicator2 and not stats.indicator1
+        assert stats.messages == 1
+
+        await client.set_settings(Settings(BRI=42))
+        assert (await client.get_settings()).BRI == 42
+        assert (await client.get_stats()).bri == 42
+
+        emulator.screen = list(range(256))
+        assert await client.get_screen() == Screen(matrix=list(range(256)))
+        assert TransitionType.SLIDE in await client.get_transitions()
+
+        await client.reboot()
+        assert (await client.get_loops()).loops == list(NATIVE_APPS)
+        assert (await client.get_settings()).BRI == 42
+
+        await client.erase()
+        assert (await client.get_settings()).BRI == 120
+        assert emulator.free_ram == emulator.ram
+
+
+async def test_emulator_ram(make_awtrix_http_client):
+    async with AwtrixEmulator(ram=100) as emulator:
+        async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+            with pytest.raises(AwtrixLightHttpClientError) as e:
+                await client.set_custom_application(
+                    "big", CustomApplication(text="x" * 200)
+                )
+            assert e.value.status_code == 500
+            assert "big" not in emulator.apps
+
+
+async def test_emulator_failures(emulator: AwtrixEmulator, make_awtrix_http_client):
+    emulator.fail_next(503)
+    emulator.fail_next(None)
+
+    async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+        with pytest.raises(AwtrixLightHttpClientError) as e:
+            await client.get_stats()
+        assert e.value.status_code == 503
+        with pytest.raises(httpx.RemoteProtocolError):
+            await client.get_stats()
+        await client.get_stats()
+
+    emulator.fail_next(500, count=2)
+    async with make_awtrix_http_client(
+        f"{emulator.base_url}api", retry_policy=RetryPolicy(max_retries=1, backoff=0)
+    ) as client:
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.get_stats()
+
+    assert emulator.requests[-1] == ("GET", "stats")
+
+
+async def test_emulator_failure_rate(make_awtrix_http_client):
+    async with AwtrixEmulator(failure_rate=1) as emulator:
+        async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+            with pytest.raises(AwtrixLightHttpClientError):
+                await client.get_stats()
+
+    with pytest.raises(ValueError, match="failure_rate"):
+        AwtrixEmulator(failure_rate=2)
+
+
+async def test_emulator_latency_and_connections(make_awtrix_http_client):
+    async with AwtrixEmulator(latency=0.05, max_connections=1) as emulator:
+        async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+            results = await asyncio.gather(
+                client.get_stats(), client.get_stats(), return_exceptions=True
+            )
+
+    assert sum(isinstance(r, httpx.TransportError) for r in results) == 1
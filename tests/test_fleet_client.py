@@ -0,0 +1,152 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from pydantic_extra_types.color import Color
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.fleet_client import AwtrixLightFleetClient, FleetResult
+from awtrix_light_client.http_client import (
+    AwtrixLightHttpClient,
+    AwtrixLightHttpClientError,
+)
+from awtrix_light_client.models.application import (
+    ApplicationTemplate,
+    CustomApplication,
+    Notification,
+)
+
+
+async def test_notify(
+    awtrix_fleet_client: AsyncIterator[AwtrixLightFleetClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        method="POST", url="http://kitchen/api/notify", match_json={"text": "test"}
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://office/api/notify",
+        match_json={"text": "test"},
+        status_code=500,
+        text="boom",
+    )
+
+    async with awtrix_fleet_client as fleet:
+        results = await fleet.notify(Notification(text="test"))
+
+    assert results["kitchen"] == FleetResult(device="kitchen")
+    assert results["kitchen"].ok
+    assert not results["office"].ok
+    assert isinstance(results["office"].error, AwtrixLightHttpClientError)
+    assert results["office"].error.status_code == 500
+
+
+async def test_get_loops(
+    awtrix_fleet_client: AsyncIterator[AwtrixLightFleetClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        method="GET", url="http://kitchen/api/loop", json={"Time": 0, "Date": 1}
+    )
+    httpx_mock.add_response(method="GET", url="http://office/api/loop", json={})
+
+    async with awtrix_fleet_client as fleet:
+        results = await fleet.get_loops()
+
+    assert results["kitchen"].result.loops == ["Time", "Date"]
+    assert results["office"].result.loops == []
+
+
+async def test_subset_of_devices(
+    awtrix_fleet_client: AsyncIterator[AwtrixLightFleetClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(method="POST", url="http://office/api/reboot")
+
+    async with awtrix_fleet_client as fleet:
+        assert fleet.devices == ["kitchen", "office"]
+        results = await fleet.run(lambda client: client.reboot(), devices=["office"])
+
+    assert list(results) == ["office"]
+
+    with pytest.raises(KeyError, match="unknown device"):
+        await fleet.run(lambda client: client.reboot(), devices=["garage"])
+
+
+async def test_compiled_and_packed_colors(
+    awtrix_fleet_client: AsyncIterator[AwtrixLightFleetClient], httpx_mock: HTTPXMock
+):
+    for device in ("kitchen", "office"):
+        httpx_mock.add_response(
+            method="POST",
+            url=f"http://{device}/api/notify",
+            match_json={"color": "#FF00FF", "text": "42"},
+        )
+        httpx_mock.add_response(
+            method="POST",
+            url=f"http://{device}/api/custom?name=test",
+            match_json={"text": "test", "color": "#00FF00"},
+        )
+        httpx_mock.add_response(
+            method="POST",
+            url=f"http://{device}/api/indicator1",
+            match_json={"color": "#0000FF"},
+        )
+
+    template = ApplicationTemplate(Notification(color=0xFF00FF), fields=["text"])
+    async with awtrix_fleet_client as fleet:
+        results = [
+            await fleet.notify(template.render(text="42")),
+            await fleet.set_custom_application(
+                "test", CustomApplication(text="test", color=0x00FF00).compile()
+            ),
+            await fleet.set_indicator(1, color=0x0000FF),
+        ]
+
+    for result in results:
+        assert all(r.ok for r in result.values())
+
+
+async def test_wrong_indicator_param(
+    awtrix_fleet_client: AsyncIterator[AwtrixLightFleetClient],
+):
+    with pytest.raises(ValueError, match="fade and blink can't be set together"):
+        async with awtrix_fleet_client as fleet:
+            await fleet.set_indicator(1, color=Color("#FF00FF"), fade=2, blink=2)
+
+
+class _SlowClient(AwtrixLightHttpClient):
+    def __init__(self, delay: float, tracker: dict[str, int]) -> None:
+        self._delay = delay
+        self._tracker = tracker
+
+    async def next_app(self) -> None:
+        self._tracker["current"] += 1
+        self._tracker["max"] = max(self._tracker["max"], self._tracker["current"])
+        try:
+            await asyncio.sleep(self._delay)
+        finally:
+            self._tracker["current"] -= 1
+
+
+async def test_concurrency_and_timeout():
+    tracker = {"current": 0, "max": 0}
+    fleet = AwtrixLightFleetClient(
+        {
+            "fast1": _SlowClient(0, tracker),
+            "fast2": _SlowClient(0, tracker),
+            "fast3": _SlowClient(0, tracker),
+            "slow": _SlowClient(10, tracker),
+        },
+        max_concurrency=2,
+        timeout=0.1,
+    )
+
+    results = await fleet.next_app()
+
+    assert tracker["max"] == 2
+    assert all(results[name].ok for name in ("fast1", "fast2", "fast3"))
+    assert isinstance(results["slow"].error, asyncio.TimeoutError)
+
+
+async def test_wrong_max_concurrency():
+    with pytest.raises(ValueError, match="max_concurrency must be greater than 0"):
+        AwtrixLightFleetClient({}, max_concurrency=0)
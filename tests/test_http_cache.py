@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+from httpx import Request, Response
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_cache import ResponseCache
+from awtrix_light_client.http_client import (
+    AwtrixLightHttpClientError,
+    get_awtrix_http_client,
+)
+from awtrix_light_client.models.effect import EffectType
+from awtrix_light_client.models.setting import Settings
+
+
+async def test_ttl(monkeypatch):
+    cache = ResponseCache({"effects": 5})
+
+    cache.set("device", "effects", b"[]")
+    cache.set("device", "stats", b"{}")
+    assert cache.get("device", "effects") == b"[]"
+    assert cache.get("device", "stats") is None
+    assert cache.get("other", "effects") is None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("device", "effects") is None
+
+
+async def test_invalidation():
+    cache = ResponseCache()
+    for endpoint in ("effects", "settings", "loop"):
+        cache.set("device", endpoint, b"[]")
+    cache.set("other", "settings", b"{}")
+
+    cache.invalidate_for("device", "power")
+    assert cache.get("device", "loop") == b"[]"
+    cache.invalidate_for("device", "settings")
+    assert cache.get("device", "settings") is None
+    assert cache.get("other", "settings") == b"{}"
+    # native apps can be turned on or off by the settings
+    assert cache.get("device", "loop") is None
+
+    cache.set("device", "loop", b"[]")
+    cache.invalidate_for("device", "resetSettings")
+    assert cache.get("device", "loop") is None
+
+    cache.set("device", "loop", b"[]")
+    cache.invalidate_for("device", "custom")
+    assert cache.get("device", "loop") is None
+    assert cache.get("device", "effects") == b"[]"
+
+    cache.invalidate_for("device", "reboot")
+    assert cache.get("device", "effects") is None
+
+    cache.observe_version("other", "0.96")
+    assert cache.get("other", "settings") is None
+
+
+async def test_client_cache(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client, device_stats: dict
+):
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}effects", json=["Fade"], is_reusable=True
+    )
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}settings", json={"BRI": 10}, is_reusable=True
+    )
+    httpx_mock.add_response(method="POST", url=f"{base_url}settings")
+    httpx_mock.add_response(method="POST", url=f"{base_url}doupdate", status_code=500)
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}stats", json=device_stats, is_reusable=True
+    )
+
+    async with make_awtrix_http_client(cache=ResponseCache()) as client:
+        assert await client.get_effects() == [EffectType.FADE]
+        assert await client.get_effects() == [EffectType.FADE]
+        assert (await client.get_settings()).BRI == 10
+        assert (await client.get_settings()).BRI == 10
+        assert len(httpx_mock.get_requests(method="GET")) == 2
+
+        await client.set_settings(Settings(BRI=10))
+        await client.get_settings()
+        assert (
+            len(httpx_mock.get_requests(url=f"{base_url}settings", method="GET")) == 2
+        )
+
+        # a failed update may still have restarted the device
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.update()
+        await client.get_effects()
+        assert len(httpx_mock.get_requests(url=f"{base_url}effects")) == 2
+
+        # the first stats report a firmware version, entries are keyed by it
+        await client.get_stats()
+        await client.get_effects()
+        assert len(httpx_mock.get_requests(url=f"{base_url}effects")) == 3
+        await client.get_stats()
+        await client.get_effects()
+        assert len(httpx_mock.get_requests(url=f"{base_url}effects")) == 3
+
+
+async def test_client_cache_write_during_get(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    bri = 10
+
+    async def slow_settings(request: Request) -> Response:
+        value = bri
+        await asyncio.sleep(0.05)
+        return Response(200, json={"BRI": value})
+
+    httpx_mock.add_callback(
+        slow_settings, method="GET", url=f"{base_url}settings", is_reusable=True
+    )
+
+    async def write_settings(request: Request) -> Response:
+        nonlocal bri
+        bri = 99
+        return Response(200)
+
+    httpx_mock.add_callback(write_settings, method="POST", url=f"{base_url}settings")
+
+    async with make_awtrix_http_client(cache=ResponseCache()) as client:
+        # the read started before the write answers after it
+        before = asyncio.ensure_future(client.get_settings())
+        await asyncio.sleep(0.01)
+        await client.set_settings(Settings(BRI=99))
+        assert (await before).BRI == 10
+
+        # the body read before the write was not cached
+        assert (await client.get_settings()).BRI == 99
+        assert (await client.get_settings()).BRI == 99
+        assert len(httpx_mock.get_requests(method="GET")) == 2
+
+
+async def test_generation():
+    cache = ResponseCache()
+    generation = cache.generation("device")
+    cache.invalidate_for("device", "settings")
+    cache.set("device", "settings", b"{}", generation)
+    assert cache.get("device", "settings") is None
+
+    cache.set("device", "settings", b"{}", cache.generation("device"))
+    cache.invalidate_for("device", "power")
+    assert cache.get("device", "settings") == b"{}"
+
+    generation = cache.generation("other")
+    cache.invalidate()
+    cache.set("other", "settings", b"{}", generation)
+    assert cache.get("other", "settings") is None
+
+
+async def test_cache_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "response_cache": true}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        assert isinstance(client._cache, ResponseCache)
@@ -1,12 +1,21 @@
+import asyncio
+import json
+from array import array
 from typing import AsyncIterator
 
 import pytest
+from httpx import AsyncClient, Request, Response, Timeout
 from pydantic import ValidationError
 from pydantic_extra_types.color import Color
 from pytest_httpx import HTTPXMock
 
-from awtrix_light_client.http_client import AwtrixLightHttpClient
+from awtrix_light_client.http_client import (
+    AwtrixLightHttpClient,
+    get_awtrix_http_client,
+)
 from awtrix_light_client.models.application import (
+    ApplicationTemplate,
+    CompiledApplication,
     CustomApplication,
     Db,
     Dc,
@@ -25,10 +34,11 @@ from awtrix_light_client.models.application import (
 from awtrix_light_client.models.effect import EffectSetting, EffectType, Palette
 from awtrix_light_client.models.loop import Loop
 from awtrix_light_client.models.moodlight import Moodlight
-from awtrix_light_client.models.screen import Screen
+from awtrix_light_client.models.screen import PackedScreen, Screen
 from awtrix_light_client.models.setting import Settings
 from awtrix_light_client.models.stat import Stats
 from awtrix_light_client.models.transition import TransitionType
+from awtrix_light_client.models.utils import convert_color_to_hex, convert_color_to_int
 
 BASE_URL = "http://test/api/"
 
@@ -1420,3 +1430,297 @@ async def test_reset_settings(
 
     async with awtrix_http_client as client:
         assert await client.reset_settings() is None
+
+
+async def test_pool_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "connect_timeout": 1, "read_timeout": 2, "write_timeout": 3, "pool_timeout": 4}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        assert client._client.timeout == Timeout(connect=1, read=2, write=3, pool=4)
+
+
+async def test_wrong_max_in_flight():
+    with pytest.raises(ValueError, match="max_in_flight must be greater than 0"):
+        AwtrixLightHttpClient(AsyncClient(), max_in_flight=0)
+
+
+async def test_max_in_flight(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_response(request: Request) -> Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Response(200)
+
+    httpx_mock.add_callback(slow_response, url=f"{BASE_URL}nextapp", is_reusable=True)
+
+    async with make_awtrix_http_client(max_in_flight=2) as client:
+        await asyncio.gather(*(client.next_app() for _ in range(6)))
+
+    assert max_in_flight == 2
+
+
+async def test_retry_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "max_retries": 3, "circuit_breaker_threshold": 5}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        assert client._retry_policy.max_retries == 3
+        assert client._circuit_breaker.failure_threshold == 5
+
+
+async def test_stream_screen(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    first = [0] * 256
+    second = [0] * 255 + [16777215]
+    for matrix in (first, first, second):
+        httpx_mock.add_response(method="GET", url=f"{BASE_URL}screen", json=matrix)
+
+    async with make_awtrix_http_client() as client:
+        screens = []
+        async for screen in client.stream_screen(fps=1000, max_load=1):
+            screens.append(screen)
+            if len(screens) == 2:
+                break
+
+    assert screens == [Screen(matrix=first), Screen(matrix=second)]
+    assert len(httpx_mock.get_requests()) == 3
+
+
+async def test_wrong_stream_screen_param():
+    client = AwtrixLightHttpClient(AsyncClient())
+
+    with pytest.raises(ValueError, match="fps must be greater than 0"):
+        await anext(client.stream_screen(fps=0))
+
+    with pytest.raises(ValueError, match="max_load must be between 0 and 1"):
+        await anext(client.stream_screen(max_load=0))
+
+
+async def test_get_packed_screen(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    matrix = list(range(256))
+    httpx_mock.add_response(method="GET", url=f"{BASE_URL}screen", json=matrix)
+    httpx_mock.add_response(method="GET", url=f"{BASE_URL}screen", json=matrix)
+
+    async with make_awtrix_http_client() as client:
+        assert await client.get_packed_screen() == PackedScreen(matrix)
+        assert await anext(client.stream_packed_screen()) == PackedScreen(matrix)
+
+
+async def test_bitmap_buffer():
+    rgb888 = bytes([255, 0, 0, 0, 255, 1, 1, 2, 3])
+    expected = [0xFF0000, 0x00FF01, 0x010203]
+
+    for bmp in (rgb888, bytearray(rgb888), memoryview(rgb888), array("B", rgb888)):
+        assert Db(x=0, y=0, w=3, h=1, bmp=bmp).model_dump()["bmp"] == expected
+    assert Db(x=0, y=0, w=3, h=1, bmp=array("q", expected)).model_dump_json() == (
+        '{"x":0,"y":0,"w":3,"h":1,"bmp":[16711680,65281,66051]}'
+    )
+    assert Db(x=0, y=0, w=1, h=1, bmp=[16711680]).model_dump()["bmp"] == [16711680]
+
+    with pytest.raises(ValidationError, match="multiple of 3"):
+        Db(x=0, y=0, w=1, h=1, bmp=b"\x00")
+    with pytest.raises(ValidationError, match="bitmap must be a RGB888 buffer"):
+        Db(x=0, y=0, w=1, h=1, bmp="0x00")
+
+
+async def test_packed_colors():
+    application = CustomApplication(
+        text=[Fragment(t="test", c=0x0000FF)],
+        color=0xFF00FF,
+        gradient=[0, Color("#00FF00")],
+        draw=[Dp(x=0, y=0, cl=0), Df(x=1, y=1, w=2, h=2, cl=0x102030)],
+    )
+
+    assert application.model_dump(exclude_none=True) == {
+        "text": [{"t": "test", "c": "#0000FF"}],
+        "color": "#FF00FF",
+        "gradient": ["#000000", "#00FF00"],
+        "draw": [
+            {"x": 0, "y": 0, "cl": "#000000"},
+            {"x": 1, "y": 1, "w": 2, "h": 2, "cl": "#102030"},
+        ],
+    }
+    assert Moodlight(color=0xFF00FF).model_dump(exclude_none=True) == {
+        "color": "#FF00FF"
+    }
+
+    with pytest.raises(ValidationError):
+        Dp(x=0, y=0, cl=0x1000000)
+    with pytest.raises(ValidationError):
+        Dp(x=0, y=0, cl=True)
+    with pytest.raises(ValidationError):
+        CustomApplication(color=False)
+
+
+async def test_application_template_packed_colors():
+    template = ApplicationTemplate(
+        CustomApplication(text="test"), fields=["color", "gradient", "draw"]
+    )
+    values = {
+        "color": 0xFF00FF,
+        "gradient": [1, Color("red")],
+        "draw": [Dp(x=0, y=0, cl=0x102030)],
+    }
+
+    rendered = template.render(**values)
+    assert (
+        rendered.content
+        == CustomApplication(text="test", **values)
+        .model_dump_json(exclude_none=True)
+        .encode()
+    )
+
+
+async def test_color_conversions():
+    for value in ("blue", "#12345680", (1, 2, 3, 0.5), "hsl(33, 77%, 12%)"):
+        color = Color(value)
+        assert convert_color_to_hex(color) == color.as_hex(format="long").upper()
+        assert convert_color_to_int(color) == int(color.as_hex(format="long")[1:], 16)
+    assert convert_color_to_hex(0x00FF01) == "#00FF01"
+    assert convert_color_to_int(0x00FF01) == 0x00FF01
+
+
+async def test_set_indicator_packed_color(
+    awtrix_http_client: AsyncIterator[AwtrixLightHttpClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}indicator1",
+        match_json={"color": "#FF00FF"},
+    )
+
+    async with awtrix_http_client as client:
+        assert await client.set_indicator(1, color=0xFF00FF) is None
+
+
+async def test_compiled_application():
+    application = CustomApplication(
+        text=[Fragment(t="test", c=Color("blue"))],
+        color=Color("blue"),
+        gradient=[Color("blue"), Color("red")],
+        pushIcon=PushIcon.MOVING,
+        draw=[Dp(x=0, y=0, cl=Color("blue")), Db(x=0, y=0, w=1, h=1, bmp=b"\0\0\1")],
+        effect=EffectType.FADE,
+        lifetime=10,
+    )
+    compiled = application.compile()
+    application.text = "changed"
+
+    assert compiled.content == application.compile().content.replace(
+        b'"changed"', b'[{"t":"test","c":"#0000FF"}]'
+    )
+    assert compiled.application.text == [Fragment(t="test", c=Color("blue"))]
+    assert compiled.lifetime == 10
+    assert compiled == CompiledApplication(compiled.application)
+    assert hash(compiled) == hash(compiled.application.compile())
+    assert compiled != application
+    assert repr(compiled).startswith("CompiledApplication(b'{")
+    assert Notification(text="test").compile().lifetime is None
+
+
+async def test_notify_compiled(
+    awtrix_http_client: AsyncIterator[AwtrixLightHttpClient], httpx_mock: HTTPXMock
+):
+    notification = Notification(
+        text="test", color=Color("blue"), clients=["http://test.fr"]
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}notify",
+        match_json=notification.model_dump(exclude_none=True),
+        match_headers={"Content-Type": "application/json"},
+        is_reusable=True,
+    )
+
+    async with awtrix_http_client as client:
+        compiled = notification.compile()
+        assert await client.notify(compiled) is None
+        assert await client.notify(compiled) is None
+
+
+async def test_set_custom_application_compiled(
+    awtrix_http_client: AsyncIterator[AwtrixLightHttpClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}custom?name=test",
+        match_json={"text": "test", "progress": 50},
+    )
+
+    async with awtrix_http_client as client:
+        assert (
+            await client.set_custom_application(
+                "test", CustomApplication(text="test", progress=50).compile()
+            )
+            is None
+        )
+
+
+async def test_application_template():
+    template = ApplicationTemplate(
+        Notification(
+            text="ignored", color=Color("blue"), icon="4300", sound="alarm", progress=1
+        ),
+        fields=["text", "progress", "progressC"],
+    )
+
+    assert template.fields == ["progress", "progressC", "text"]
+
+    rendered = template.render(
+        text=[Fragment(t="test", c=Color("red"))], progress=50, progressC=None
+    )
+    expected = Notification(
+        text=[Fragment(t="test", c=Color("red"))],
+        color=Color("blue"),
+        icon="4300",
+        sound="alarm",
+        progress=50,
+    )
+    assert json.loads(rendered.content) == expected.model_dump(exclude_none=True)
+    assert rendered.application == expected
+    assert rendered.lifetime is None
+
+    with pytest.raises(ValidationError):
+        template.render(progress=500)
+    with pytest.raises(ValueError, match="icon is not a variable field"):
+        template.render(icon="1")
+    with pytest.raises(ValueError, match="unknown fields"):
+        ApplicationTemplate(Notification(), fields=["unknown"])
+
+
+async def test_application_template_lifetime():
+    template = ApplicationTemplate(CustomApplication(lifetime=10), fields=["text"])
+    assert template.render(text="a").lifetime == 10
+    assert template.render(text="a").content == b'{"lifetime":10,"text":"a"}'
+
+    template = ApplicationTemplate(CustomApplication(), fields=["lifetime", "effect"])
+    rendered = template.render(lifetime=20, effect=EffectType.FADE)
+    assert rendered.lifetime == 20
+    # variable fields are written in the model order
+    assert rendered.content == b'{"effect":"Fade","lifetime":20}'
+    assert template.render().content == b"{}"
+
+
+async def test_notify_template(
+    awtrix_http_client: AsyncIterator[AwtrixLightHttpClient], httpx_mock: HTTPXMock
+):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}notify",
+        match_json={"icon": "4300", "clients": ["http://test.fr/"], "text": "42"},
+    )
+
+    template = ApplicationTemplate(
+        Notification(icon="4300", clients=["http://test.fr"]), fields=["text"]
+    )
+    async with awtrix_http_client as client:
+        assert await client.notify(template.render(text="42")) is None
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from httpx import Request, Response
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_client import AwtrixLightHttpClientError
+from awtrix_light_client.http_coalescing import LatestWinsCoalescer
+from awtrix_light_client.models.application import CustomApplication
+
+
+async def test_latest_wins():
+    coalescer = LatestWinsCoalescer()
+    sent = []
+    release = asyncio.Event()
+
+    def sender(value: int):
+        async def send() -> None:
+            if value == 0:
+                await release.wait()
+            sent.append(value)
+
+        return send
+
+    first = asyncio.create_task(coalescer.submit("app", sender(0)))
+    await asyncio.sleep(0)
+    others = [asyncio.create_task(coalescer.submit("app", sender(i))) for i in (1, 2)]
+    other_key = asyncio.create_task(coalescer.submit("other", sender(3)))
+    await asyncio.sleep(0)
+
+    assert coalescer.pending("app")
+    assert sent == [3]
+
+    release.set()
+    await asyncio.gather(first, *others, other_key)
+
+    assert sent == [3, 0, 2]
+    assert not coalescer.pending("app")
+
+
+async def test_pending_error_shared():
+    coalescer = LatestWinsCoalescer()
+    release = asyncio.Event()
+
+    async def slow() -> None:
+        await release.wait()
+
+    async def failing() -> None:
+        raise ValueError("boom")
+
+    first = asyncio.create_task(coalescer.submit("app", slow))
+    await asyncio.sleep(0)
+    superseded = asyncio.create_task(coalescer.submit("app", slow))
+    latest = asyncio.create_task(coalescer.submit("app", failing))
+    await asyncio.sleep(0)
+    release.set()
+
+    await first
+    for task in (superseded, latest):
+        with pytest.raises(ValueError, match="boom"):
+            await task
+
+
+async def test_set_custom_application_coalesced(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    bodies = []
+
+    async def slow_response(request: Request) -> Response:
+        bodies.append(request.content)
+        await asyncio.sleep(0.01)
+        return Response(200)
+
+    httpx_mock.add_callback(
+        slow_response, url=f"{base_url}custom?name=sensor", is_reusable=True
+    )
+
+    async with make_awtrix_http_client(coalescer=LatestWinsCoalescer()) as client:
+        await asyncio.gather(
+            *(
+                client.set_custom_application(
+                    "sensor", CustomApplication(text=str(value))
+                )
+                for value in range(5)
+            )
+        )
+
+    assert bodies == [b'{"text":"0"}', b'{"text":"4"}']
+
+
+async def test_set_custom_application_coalesced_error(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=sensor", status_code=500
+    )
+
+    async with make_awtrix_http_client(coalescer=LatestWinsCoalescer()) as client:
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.set_custom_application("sensor", CustomApplication(text="1"))
@@ -0,0 +1,196 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ReadTimeout, Request, Response
+from pydantic_extra_types.color import Color
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_dedup import PayloadDeduplicator
+from awtrix_light_client.models.application import CustomApplication
+from awtrix_light_client.models.moodlight import Moodlight
+
+
+async def test_digest():
+    assert PayloadDeduplicator.digest(b'{"a":1}') == PayloadDeduplicator.digest(
+        b'{"a":1}'
+    )
+    assert PayloadDeduplicator.digest(b'{"a":1}') != PayloadDeduplicator.digest(
+        b'{"a":2}'
+    )
+
+
+async def test_lifetime_expiry(monkeypatch):
+    deduplicator = PayloadDeduplicator()
+    digest = deduplicator.digest(b'{"text":"test","lifetime":10}')
+    deduplicator.remember(
+        "device", "custom", "test", [{"text": "test", "lifetime": 10}], digest
+    )
+
+    assert deduplicator.is_duplicate("device", "custom", "test", digest)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 7.9)
+    assert deduplicator.is_duplicate("device", "custom", "test", digest)
+
+    # sent again before the application disappears from the device
+    monkeypatch.setattr(time, "monotonic", lambda: now + 8)
+    assert not deduplicator.is_duplicate("device", "custom", "test", digest)
+
+
+async def test_wrong_lifetime_margin():
+    with pytest.raises(ValueError, match="lifetime_margin must be between 0 and 1"):
+        PayloadDeduplicator(lifetime_margin=1)
+
+
+async def test_invalidate():
+    deduplicator = PayloadDeduplicator()
+    digest = deduplicator.digest(b"{}")
+    for device, endpoint, name in [
+        ("kitchen", "custom", "test0"),
+        ("kitchen", "custom", "test1"),
+        ("kitchen", "custom", "other"),
+        ("kitchen", "moodlight", None),
+        ("office", "custom", "test0"),
+    ]:
+        deduplicator.remember(device, endpoint, name, {"text": "t"}, digest)
+
+    deduplicator.invalidate("kitchen", "custom", "test", prefix=True)
+    assert not deduplicator.is_duplicate("kitchen", "custom", "test0", digest)
+    assert not deduplicator.is_duplicate("kitchen", "custom", "test1", digest)
+    assert deduplicator.is_duplicate("kitchen", "custom", "other", digest)
+    assert deduplicator.is_duplicate("kitchen", "moodlight", None, digest)
+    assert deduplicator.is_duplicate("office", "custom", "test0", digest)
+
+    deduplicator.remember("kitchen", "custom", "oth", [], digest)
+    assert not deduplicator.is_duplicate("kitchen", "custom", "other", digest)
+
+    deduplicator.invalidate("kitchen")
+    assert not deduplicator.is_duplicate("kitchen", "moodlight", None, digest)
+    assert deduplicator.is_duplicate("office", "custom", "test0", digest)
+
+    deduplicator.invalidate()
+    assert not deduplicator.is_duplicate("office", "custom", "test0", digest)
+
+
+async def test_skip_duplicates(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "1"}
+    )
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "2"}
+    )
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}moodlight", match_json={"color": "#FF00FF"}
+    )
+    httpx_mock.add_response(method="POST", url=f"{base_url}reboot")
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "2"}
+    )
+
+    async with make_awtrix_http_client(deduplicator=PayloadDeduplicator()) as client:
+        for text in ("1", "1", "2", "2"):
+            await client.set_custom_application("test", CustomApplication(text=text))
+        for _ in range(2):
+            await client.set_moodlight(Moodlight(color=Color("#FF00FF")))
+        await client.reboot()
+        await client.set_custom_application("test", CustomApplication(text="2"))
+
+    assert len(httpx_mock.get_requests()) == 5
+
+
+async def test_skip_compiled_duplicates(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{base_url}custom?name=test",
+        match_json={"text": "1", "lifetime": 60},
+    )
+
+    compiled = CustomApplication(text="1", lifetime=60).compile()
+    async with make_awtrix_http_client(deduplicator=PayloadDeduplicator()) as client:
+        await client.set_custom_application("test", compiled)
+        await client.set_custom_application("test", compiled)
+
+    assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_failed_send_is_forgotten(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "A"}
+    )
+    # applied by the device, but the response is lost
+    httpx_mock.add_exception(
+        ReadTimeout("timeout"),
+        method="POST",
+        url=f"{base_url}custom?name=test",
+        match_json={"text": "B"},
+    )
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "A"}
+    )
+
+    async with make_awtrix_http_client(deduplicator=PayloadDeduplicator()) as client:
+        await client.set_custom_application("test", CustomApplication(text="A"))
+        with pytest.raises(ReadTimeout):
+            await client.set_custom_application("test", CustomApplication(text="B"))
+        await client.set_custom_application("test", CustomApplication(text="A"))
+
+    assert len(httpx_mock.get_requests()) == 3
+
+
+async def test_cancelled_send_is_forgotten(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    async def applied_then_slow(request: Request) -> Response:
+        # applied by the device, but the caller gives up before the response
+        await asyncio.sleep(1)
+        return Response(200)
+
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "A"}
+    )
+    httpx_mock.add_callback(
+        applied_then_slow,
+        method="POST",
+        url=f"{base_url}custom?name=test",
+        match_json={"text": "B"},
+    )
+    httpx_mock.add_response(
+        method="POST", url=f"{base_url}custom?name=test", match_json={"text": "A"}
+    )
+
+    async with make_awtrix_http_client(deduplicator=PayloadDeduplicator()) as client:
+        await client.set_custom_application("test", CustomApplication(text="A"))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                client.set_custom_application("test", CustomApplication(text="B")),
+                0.01,
+            )
+        await client.set_custom_application("test", CustomApplication(text="A"))
+
+    assert [request.content for request in httpx_mock.get_requests()] == [
+        b'{"text":"A"}',
+        b'{"text":"B"}',
+        b'{"text":"A"}',
+    ]
+
+
+async def test_digest_of_sent_bytes(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(method="POST", url=f"{base_url}moodlight")
+
+    deduplicator = PayloadDeduplicator()
+    async with make_awtrix_http_client(deduplicator=deduplicator) as client:
+        await client.set_moodlight(Moodlight(color=Color("#FF00FF")))
+
+    content = httpx_mock.get_requests()[0].content
+    assert deduplicator.is_duplicate(
+        base_url, "moodlight", None, PayloadDeduplicator.digest(content)
+    )
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import time
+
+import pytest
+from httpx import Request, Response
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_client import get_awtrix_http_client
+from awtrix_light_client.http_dispatch import DeviceDispatcher, PriorityDispatcher
+from awtrix_light_client.http_retry import RetryPolicy
+from awtrix_light_client.models.application import CustomApplication
+
+
+async def test_wrong_max_in_flight():
+    with pytest.raises(ValueError, match="max_in_flight must be greater than 0"):
+        DeviceDispatcher(0)
+
+
+async def test_fifo():
+    dispatcher = DeviceDispatcher(1)
+    order = []
+
+    async def request(i: int) -> None:
+        async with dispatcher.slot():
+            order.append(i)
+            await asyncio.sleep(0)
+
+    await dispatcher.acquire()
+    tasks = [asyncio.ensure_future(request(i)) for i in range(5)]
+    await asyncio.sleep(0)
+    assert dispatcher.in_flight == 1
+    assert dispatcher.queued == 5
+
+    dispatcher.release()
+    # a request arriving while others wait can't overtake them
+    tasks.append(asyncio.ensure_future(request(5)))
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2, 3, 4, 5]
+    assert dispatcher.in_flight == 0
+    assert dispatcher.queued == 0
+
+
+async def test_cancelled_waiter():
+    dispatcher = DeviceDispatcher(1)
+    await dispatcher.acquire()
+
+    cancelled = asyncio.ensure_future(dispatcher.acquire())
+    waiting = asyncio.ensure_future(dispatcher.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert dispatcher.queued == 1
+
+    dispatcher.release()
+    await waiting
+    assert dispatcher.in_flight == 1
+    dispatcher.release()
+    assert dispatcher.in_flight == 0
+
+
+async def test_cancelled_after_handover():
+    dispatcher = DeviceDispatcher(1)
+    await dispatcher.acquire()
+
+    cancelled = asyncio.ensure_future(dispatcher.acquire())
+    await asyncio.sleep(0)
+    # the slot is handed over, then the waiter is cancelled before resuming
+    dispatcher.release()
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert dispatcher.in_flight == 0
+    await dispatcher.acquire()
+    assert dispatcher.in_flight == 1
+
+
+async def test_client_dispatcher(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    in_flight = 0
+    max_in_flight = 0
+    received = []
+
+    async def slow_response(request: Request) -> Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        received.append(json.loads(request.content)["name"])
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Response(200)
+
+    httpx_mock.add_callback(slow_response, is_reusable=True)
+
+    dispatcher = DeviceDispatcher(1)
+    # both clients of the device share its queue
+    async with (
+        make_awtrix_http_client(dispatcher=dispatcher) as first,
+        make_awtrix_http_client(max_in_flight=4, dispatcher=dispatcher) as second,
+    ):
+        await asyncio.gather(
+            *((first if i % 2 else second).switch_app(str(i)) for i in range(6))
+        )
+
+    assert max_in_flight == 1
+    assert received == [str(i) for i in range(6)]
+
+
+async def test_retry_keeps_order(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    applied = []
+    failed = False
+
+    async def flaky_response(request: Request) -> Response:
+        nonlocal failed
+        if not failed:
+            failed = True
+            return Response(503)
+        applied.append(json.loads(request.content)["text"])
+        return Response(200)
+
+    httpx_mock.add_callback(flaky_response, is_reusable=True)
+
+    async with make_awtrix_http_client(
+        max_in_flight=1, retry_policy=RetryPolicy(max_retries=1, backoff=0.01)
+    ) as client:
+        await asyncio.gather(
+            client.set_custom_application("x", CustomApplication(text="1")),
+            client.set_custom_application("x", CustomApplication(text="2")),
+        )
+
+    # the retried write is not overtaken by the later one
+    assert applied == ["1", "2"]
+
+
+async def test_wrong_aging():
+    with pytest.raises(ValueError, match="aging must be greater than 0"):
+        PriorityDispatcher(aging=0)
+
+
+async def _acquire_in_order(
+    dispatcher: DeviceDispatcher, endpoints: list[str]
+) -> list[str]:
+    order = []
+
+    async def request(endpoint: str) -> None:
+        async with dispatcher.slot(endpoint):
+            order.append(endpoint)
+
+    await dispatcher.acquire()
+    tasks = []
+    for endpoint in endpoints:
+        tasks.append(asyncio.ensure_future(request(endpoint)))
+        await asyncio.sleep(0)
+    dispatcher.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_priorities():
+    order = await _acquire_in_order(
+        PriorityDispatcher(),
+        ["custom", "stats", "switch", "custom", "notify", "indicator1"],
+    )
+    assert order == ["notify", "indicator1", "switch", "custom", "stats", "custom"]
+
+    # the FIFO dispatcher ignores the endpoints
+    order = await _acquire_in_order(DeviceDispatcher(), ["custom", "notify"])
+    assert order == ["custom", "notify"]
+
+
+async def test_aging(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    dispatcher = PriorityDispatcher(aging=1.0)
+    await dispatcher.acquire()
+
+    order = []
+
+    async def request(endpoint: str) -> None:
+        async with dispatcher.slot(endpoint):
+            order.append(endpoint)
+
+    custom = asyncio.ensure_future(request("custom"))
+    await asyncio.sleep(0)
+    now += 1.5
+    switch = asyncio.ensure_future(request("switch"))
+    notify = asyncio.ensure_future(request("notify"))
+    await asyncio.sleep(0)
+    assert dispatcher.queued == 3
+
+    dispatcher.release()
+    await asyncio.gather(custom, switch, notify)
+    # waiting 1.5 seconds raised the custom application over the newer normal request only
+    assert order == ["notify", "custom", "switch"]
+    assert dispatcher.in_flight == 0
+
+
+async def test_priority_cancelled_waiter():
+    dispatcher = PriorityDispatcher()
+    await dispatcher.acquire()
+
+    cancelled = asyncio.ensure_future(dispatcher.acquire("notify"))
+    waiting = asyncio.ensure_future(dispatcher.acquire("custom"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert dispatcher.queued == 1
+
+    dispatcher.release()
+    await waiting
+    dispatcher.release()
+    assert dispatcher.in_flight == 0
+
+
+async def test_priority_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "priority_aging": 2}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        assert isinstance(client._dispatcher, PriorityDispatcher)
+        assert client._dispatcher.aging == 2
+        assert client._dispatcher.max_in_flight == 1
+
+
+async def test_client_priorities(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    received = []
+
+    async def slow_response(request: Request) -> Response:
+        received.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return Response(200)
+
+    httpx_mock.add_callback(slow_response, is_reusable=True)
+
+    async with make_awtrix_http_client(dispatcher=PriorityDispatcher()) as client:
+        tasks = [
+            asyncio.ensure_future(
+                client.set_custom_application("app", CustomApplication(text="42"))
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(client.dismiss_notification()))
+        await asyncio.gather(*tasks)
+
+    assert received == [
+        "/api/custom",
+        "/api/notify/dismiss",
+        "/api/custom",
+        "/api/custom",
+    ]
@@ -0,0 +1,122 @@
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.fleet_client import get_awtrix_fleet_client
+from awtrix_light_client.http_client import AwtrixLightHttpClientError
+from awtrix_light_client.http_metrics import (
+    LATENCY_BUCKETS,
+    Histogram,
+    MetricsRegistry,
+)
+from awtrix_light_client.http_settings import AwtrixHttpConfig
+from awtrix_light_client.models.application import CustomApplication
+
+
+async def test_histogram():
+    histogram = Histogram([1, 2, 4])
+    assert histogram.mean is None
+    assert histogram.quantile(0.5) is None
+
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.mean == 3.2
+    assert histogram.quantile(0.4) == 1
+    assert histogram.quantile(0.5) == 2
+    assert histogram.quantile(1) == float("inf")
+
+    other = Histogram([1, 2, 4])
+    other.observe(2)
+    histogram.merge(other)
+    assert histogram.counts == [2, 2, 1, 1]
+
+    with pytest.raises(ValueError, match="same bounds"):
+        histogram.merge(Histogram([1]))
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        histogram.quantile(2)
+
+
+async def test_client_metrics(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(method="POST", url=f"{base_url}custom?name=test")
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}effects", json=["Fade", "Plasma"]
+    )
+    httpx_mock.add_response(method="POST", url=f"{base_url}power", status_code=400)
+    httpx_mock.add_exception(httpx.ReadTimeout("timeout"), url=f"{base_url}loop")
+    metrics = MetricsRegistry()
+
+    async with make_awtrix_http_client(metrics=metrics) as client:
+        await client.set_custom_application("test", CustomApplication(text="test"))
+        await client.get_effects()
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.set_power(True)
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get_loops()
+
+    assert sorted(metrics.keys()) == [
+        (base_url, "custom"),
+        (base_url, "effects"),
+        (base_url, "loop"),
+        (base_url, "power"),
+    ]
+    assert metrics.in_flight() == 0
+
+    custom = metrics.get(base_url, "custom")
+    assert custom.requests == 1
+    assert custom.errors == 0
+    assert custom.request_size.total == len(b'{"text":"test"}')
+    assert custom.serialization.count == 1
+    assert custom.latency.bounds == LATENCY_BUCKETS
+
+    assert metrics.get(endpoint="effects").response_size.total == len(
+        b'["Fade","Plasma"]'
+    )
+    assert metrics.get(endpoint="power").errors == 1
+    assert metrics.get(endpoint="loop").response_size.total == 0
+
+    total = metrics.get()
+    assert total.requests == 4
+    assert total.errors == 2
+
+    metrics.reset()
+    assert metrics.keys() == []
+
+
+async def test_in_flight(httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client):
+    metrics = MetricsRegistry()
+    seen = []
+
+    def callback(request: httpx.Request) -> httpx.Response:
+        seen.append(metrics.in_flight(base_url))
+        return httpx.Response(200)
+
+    httpx_mock.add_callback(callback, url=f"{base_url}power")
+
+    async with make_awtrix_http_client(metrics=metrics) as client:
+        await client.set_power(True)
+
+    assert seen == [1]
+    assert metrics.in_flight(base_url) == 0
+
+
+async def test_fleet_metrics(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="http://kitchen/api/power")
+    httpx_mock.add_response(url="http://office/api/power")
+    metrics = MetricsRegistry()
+
+    async with get_awtrix_fleet_client(
+        devices={
+            "kitchen": AwtrixHttpConfig(base_url="http://kitchen/"),
+            "office": AwtrixHttpConfig(base_url="http://office/"),
+        },
+        metrics=metrics,
+    ) as client:
+        await client.set_power(True)
+
+    assert metrics.get(endpoint="power").requests == 2
+    assert metrics.get(device="http://kitchen/api/").requests == 1
@@ -0,0 +1,188 @@
+import asyncio
+import time
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_client import (
+    AwtrixLightCircuitOpenError,
+    AwtrixLightHttpClientError,
+    AwtrixLightRateLimitedError,
+    get_awtrix_http_client,
+)
+from awtrix_light_client.http_metrics import MetricsRegistry
+from awtrix_light_client.http_rate_limit import RateLimiter, TokenBucket
+from awtrix_light_client.http_retry import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize(
+    "rate, burst, message",
+    [(0, 1, "rate must be greater than 0"), (1, 0, "burst must be greater than 0")],
+)
+async def test_wrong_bucket(rate, burst, message):
+    with pytest.raises(ValueError, match=message):
+        TokenBucket(rate, burst)
+    with pytest.raises(ValueError, match=message):
+        RateLimiter(1, endpoints={"custom": (rate, burst)})
+
+
+async def test_wrong_mode():
+    with pytest.raises(ValueError, match="mode must be wait or drop"):
+        RateLimiter(1, mode="queue")
+
+
+async def test_token_bucket(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.reserve(clock[0]) for _ in range(5)] == [0, 0, 0, 0.5, 1.0]
+    assert bucket.tokens(clock[0]) == -2
+
+    clock[0] += 10
+    assert bucket.tokens(clock[0]) == 3
+
+
+async def test_refund(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.refund(clock[0])
+    assert bucket.tokens(clock[0]) == 2
+
+    bucket.reserve(clock[0])
+    bucket.reserve(clock[0])
+    bucket.reserve(clock[0])
+    bucket.refund(clock[0])
+    assert bucket.tokens(clock[0]) == 0
+
+    limiter = RateLimiter(10, endpoints={"custom": (1, 1)})
+    limiter.acquire("device", "custom")
+    assert limiter.acquire("device", "custom") == pytest.approx(1)
+    limiter.refund("device", "custom")
+    assert limiter.acquire("device", "custom") == pytest.approx(1)
+
+
+async def test_wait_mode(clock):
+    limiter = RateLimiter(10, burst=2, endpoints={"custom": (1, 1)})
+
+    assert limiter.acquire("device", "custom") == 0
+    assert limiter.acquire("device", "custom") == pytest.approx(1)
+    # the device budget is shared by every endpoint
+    assert limiter.acquire("device", "notify") == pytest.approx(0.1)
+    # devices have their own budget
+    assert limiter.acquire("other", "custom") == 0
+
+    limiter.reset("device")
+    assert limiter.acquire("device", "custom") == 0
+    assert limiter.acquire("other", "custom") == pytest.approx(1)
+
+
+async def test_drop_mode(clock):
+    limiter = RateLimiter(10, burst=2, endpoints={"custom": (1, 1)}, mode="drop")
+
+    assert limiter.acquire("device", "custom") == 0
+    assert limiter.acquire("device", "custom") is None
+    assert limiter.acquire("device", "notify") == 0
+    assert limiter.acquire("device", "notify") is None
+
+    clock[0] += 1
+    assert limiter.acquire("device", "custom") == 0
+
+
+async def test_client_wait(
+    httpx_mock: HTTPXMock, monkeypatch, clock, make_awtrix_http_client
+):
+    delays = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    httpx_mock.add_response(is_reusable=True)
+    metrics = MetricsRegistry()
+
+    async with make_awtrix_http_client(
+        rate_limiter=RateLimiter(10, burst=2), metrics=metrics
+    ) as client:
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+        for _ in range(3):
+            await client.next_app()
+
+    assert len(httpx_mock.get_requests()) == 3
+    assert delays == [pytest.approx(0.1)]
+    result = metrics.get(endpoint="nextapp")
+    assert result.requests == 3
+    assert result.throttled == 1
+    assert result.dropped == 0
+    assert result.throttle_wait.count == 1
+
+
+async def test_client_cancelled_wait(
+    httpx_mock: HTTPXMock, clock, make_awtrix_http_client
+):
+    httpx_mock.add_response(is_reusable=True)
+    limiter = RateLimiter(1)
+
+    async with make_awtrix_http_client(rate_limiter=limiter) as client:
+        await client.next_app()
+        waiter = asyncio.create_task(client.next_app())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert len(httpx_mock.get_requests()) == 1
+    # the token reserved by the cancelled request is given back
+    assert limiter.acquire(client._device, "nextapp") == pytest.approx(1)
+
+
+async def test_client_circuit_open(httpx_mock: HTTPXMock, make_awtrix_http_client):
+    httpx_mock.add_response(status_code=500)
+    limiter = RateLimiter(1, burst=2)
+
+    async with make_awtrix_http_client(
+        rate_limiter=limiter,
+        circuit_breaker=CircuitBreaker(failure_threshold=1, recovery_time=60),
+    ) as client:
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.next_app()
+        for _ in range(6):
+            # fails fast without waiting for a token
+            with pytest.raises(AwtrixLightCircuitOpenError):
+                await asyncio.wait_for(client.next_app(), 0.1)
+
+    assert len(httpx_mock.get_requests()) == 1
+    assert limiter.acquire(client._device, "nextapp") == 0
+
+
+async def test_client_drop(httpx_mock: HTTPXMock, clock, make_awtrix_http_client):
+    httpx_mock.add_response()
+    metrics = MetricsRegistry()
+
+    async with make_awtrix_http_client(
+        rate_limiter=RateLimiter(1, mode="drop"), metrics=metrics
+    ) as client:
+        await client.next_app()
+        with pytest.raises(AwtrixLightRateLimitedError) as e:
+            await client.next_app()
+
+    assert e.value.status_code == 429
+    assert len(httpx_mock.get_requests()) == 1
+    result = metrics.get()
+    assert result.requests == 1
+    assert result.dropped == 1
+    assert result.throttled == 0
+
+
+async def test_rate_limit_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "rate_limit": 5, "rate_limit_burst": 2, "rate_limit_endpoints": {"custom": [1, 1]}, "rate_limit_mode": "drop"}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        limiter = client._rate_limiter
+        assert (limiter.rate, limiter.burst, limiter.mode) == (5, 2, "drop")
+        assert limiter.endpoints == {"custom": (1, 1)}
@@ -0,0 +1,115 @@
+import pytest
+from httpx import ConnectError, ReadTimeout
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_client import (
+    AwtrixLightCircuitOpenError,
+    AwtrixLightHttpClientError,
+)
+from awtrix_light_client.http_retry import CircuitBreaker, RetryPolicy
+from awtrix_light_client.models.application import Notification
+
+
+async def test_retry_policy():
+    policy = RetryPolicy(max_retries=2, backoff=1, max_backoff=3)
+
+    assert policy.is_idempotent("GET", "stats")
+    assert policy.is_idempotent("POST", "custom")
+    assert not policy.is_idempotent("POST", "notify")
+    assert policy.should_retry_status("GET", "stats", 503)
+    assert not policy.should_retry_status("GET", "stats", 404)
+    assert not policy.should_retry_status("POST", "notify", 503)
+    assert policy.should_retry_error("POST", "notify", ConnectError("refused"))
+    assert not policy.should_retry_error("POST", "notify", ReadTimeout("timeout"))
+    assert policy.should_retry_error("POST", "custom", ReadTimeout("timeout"))
+    assert 0 <= policy.delay(0) <= 1
+    assert 0 <= policy.delay(10) <= 3
+
+
+async def test_wrong_retry_policy():
+    with pytest.raises(ValueError, match="max_retries must be positive"):
+        RetryPolicy(max_retries=-1)
+
+
+async def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=0)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.retry_after() == 0
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_time=60)
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow_request()
+    assert 0 < breaker.retry_after() <= 60
+
+
+async def test_wrong_circuit_breaker():
+    with pytest.raises(ValueError, match="failure_threshold must be greater than 0"):
+        CircuitBreaker(failure_threshold=0)
+
+
+async def test_retry_on_server_error(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(method="GET", url=f"{base_url}loop", status_code=503)
+    httpx_mock.add_exception(ConnectError("refused"), url=f"{base_url}loop")
+    httpx_mock.add_response(method="GET", url=f"{base_url}loop", json={"Time": 0})
+
+    async with make_awtrix_http_client(
+        retry_policy=RetryPolicy(max_retries=2, backoff=0)
+    ) as client:
+        assert (await client.get_loops()).loops == ["Time"]
+
+
+async def test_retry_exhausted(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}loop", status_code=503, is_reusable=True
+    )
+
+    async with make_awtrix_http_client(
+        retry_policy=RetryPolicy(max_retries=2, backoff=0)
+    ) as client:
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.get_loops()
+
+    assert len(httpx_mock.get_requests()) == 3
+
+
+async def test_no_retry_non_idempotent(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_exception(ReadTimeout("timeout"), url=f"{base_url}notify")
+
+    async with make_awtrix_http_client(
+        retry_policy=RetryPolicy(max_retries=2, backoff=0)
+    ) as client:
+        with pytest.raises(ReadTimeout):
+            await client.notify(Notification(text="test"))
+
+
+async def test_circuit_breaker_fail_fast(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_exception(ConnectError("refused"), url=f"{base_url}stats")
+    httpx_mock.add_response(method="POST", url=f"{base_url}nextapp", status_code=500)
+
+    async with make_awtrix_http_client(
+        circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_time=60)
+    ) as client:
+        with pytest.raises(ConnectError):
+            await client.get_stats()
+        with pytest.raises(AwtrixLightHttpClientError):
+            await client.next_app()
+        with pytest.raises(AwtrixLightCircuitOpenError) as e:
+            await client.next_app()
+
+    assert e.value.status_code == 503
+    assert 0 < e.value.retry_after <= 60
@@ -1,7 +1,10 @@
 import pytest
 from pydantic import ValidationError
 
-from awtrix_light_client.http_settings import AwtrixLightHttpClientSettings
+from awtrix_light_client.http_settings import (
+    AwtrixLightFleetClientSettings,
+    AwtrixLightHttpClientSettings,
+)
 
 
 async def test_no_settings():
@@ -29,3 +32,55 @@ async def test_works_auth(monkeypatch):
     )
 
     AwtrixLightHttpClientSettings()
+
+
+async def test_fleet_works(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_DEVICES",
+        '{"kitchen": {"base_url": "http://kitchen.fr"}, "office": {"base_url": "http://office.fr", "username": "username", "password": "password"}}',
+    )
+
+    settings = AwtrixLightFleetClientSettings()
+
+    assert list(settings.devices) == ["kitchen", "office"]
+
+
+async def test_works_pool(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test.fr", "max_connections": 2, "max_keepalive_connections": 1, "keepalive_expiry": 30, "read_timeout": 10, "pool_timeout": null, "max_in_flight": 1}',
+    )
+
+    settings = AwtrixLightHttpClientSettings()
+
+    assert settings.awtrix.max_connections == 2
+    assert settings.awtrix.max_keepalive_connections == 1
+    assert settings.awtrix.keepalive_expiry == 30
+    assert settings.awtrix.connect_timeout == 5
+    assert settings.awtrix.read_timeout == 10
+    assert settings.awtrix.pool_timeout is None
+    assert settings.awtrix.max_in_flight == 1
+
+
+async def test_wrong_pool(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test.fr", "max_in_flight": 0}',
+    )
+
+    with pytest.raises(ValidationError):
+        AwtrixLightHttpClientSettings()
+
+
+async def test_works_retry(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test.fr", "max_retries": 3, "circuit_breaker_threshold": 5}',
+    )
+
+    settings = AwtrixLightHttpClientSettings()
+
+    assert settings.awtrix.max_retries == 3
+    assert settings.awtrix.retry_backoff == 0.1
+    assert settings.awtrix.circuit_breaker_threshold == 5
+    assert settings.awtrix.circuit_breaker_recovery_time == 30
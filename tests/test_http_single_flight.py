@@ -0,0 +1,123 @@
+import asyncio
+
+from httpx import Request, Response
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.http_client import (
+    AwtrixLightHttpClientError,
+    get_awtrix_http_client,
+)
+
+
+def _slow(response: Response):
+    async def callback(request: Request) -> Response:
+        await asyncio.sleep(0.05)
+        return response
+
+    return callback
+
+
+async def test_concurrent_gets_share_request(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client, device_stats: dict
+):
+    httpx_mock.add_callback(
+        _slow(Response(200, json=device_stats)),
+        url=f"{base_url}stats",
+        is_reusable=True,
+    )
+    httpx_mock.add_callback(
+        _slow(Response(200, json=["Fade"])), url=f"{base_url}effects"
+    )
+
+    async with make_awtrix_http_client(single_flight=True) as client:
+        results = await asyncio.gather(
+            client.get_stats(),
+            client.get_stats(),
+            client.get_stats(),
+            client.get_effects(),
+        )
+        assert results[0] == results[1] == results[2]
+        # every caller gets its own model
+        assert results[0] is not results[1]
+        assert len(httpx_mock.get_requests(url=f"{base_url}stats")) == 1
+        assert len(httpx_mock.get_requests(url=f"{base_url}effects")) == 1
+
+        # sequential requests are not shared
+        await client.get_stats()
+        assert len(httpx_mock.get_requests(url=f"{base_url}stats")) == 2
+        assert client._pending_gets == {}
+
+
+async def test_shared_failure(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_callback(_slow(Response(500)), url=f"{base_url}stats")
+
+    async with make_awtrix_http_client(single_flight=True) as client:
+        results = await asyncio.gather(
+            client.get_stats(), client.get_stats(), return_exceptions=True
+        )
+        assert all(isinstance(r, AwtrixLightHttpClientError) for r in results)
+        assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_cancelled_caller(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client, device_stats: dict
+):
+    httpx_mock.add_callback(
+        _slow(Response(200, json=device_stats)), url=f"{base_url}stats"
+    )
+
+    async with make_awtrix_http_client(single_flight=True) as client:
+        first = asyncio.ensure_future(client.get_stats())
+        second = asyncio.ensure_future(client.get_stats())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second).uid == "awtrix_fa9b04"
+        assert first.cancelled()
+        assert len(httpx_mock.get_requests()) == 1
+
+
+async def test_write_is_not_joined(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_callback(
+        _slow(Response(200, json={"BRI": 10})),
+        url=f"{base_url}settings",
+        method="GET",
+        is_reusable=True,
+    )
+    httpx_mock.add_response(url=f"{base_url}reboot", method="POST", text="OK")
+
+    async with make_awtrix_http_client(single_flight=True) as client:
+        before = asyncio.ensure_future(client.get_settings())
+        await asyncio.sleep(0.01)
+        await client.reboot()
+        # issued after the write, must not reuse the read started before it
+        after = asyncio.ensure_future(client.get_settings())
+        await asyncio.gather(before, after)
+        assert len(httpx_mock.get_requests(method="GET")) == 2
+
+
+async def test_single_flight_settings(monkeypatch):
+    monkeypatch.setenv(
+        "AWTRIX_HTTP_CLIENT_AWTRIX",
+        '{"base_url": "http://test/", "single_flight": true}',
+    )
+
+    async with get_awtrix_http_client() as client:
+        assert client._pending_gets == {}
+
+
+async def test_disabled(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client, device_stats: dict
+):
+    httpx_mock.add_callback(
+        _slow(Response(200, json=device_stats)),
+        url=f"{base_url}stats",
+        is_reusable=True,
+    )
+
+    async with make_awtrix_http_client() as client:
+        await asyncio.gather(client.get_stats(), client.get_stats())
+        assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,99 @@
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client import json_codec
+from awtrix_light_client.json_codec import (
+    OrjsonJsonCodec,
+    PydanticJsonCodec,
+    StdlibJsonCodec,
+    get_default_codec,
+    orjson,
+)
+from awtrix_light_client.models.application import CustomApplication
+from awtrix_light_client.models.screen import PackedScreen
+from awtrix_light_client.models.transition import TransitionType
+
+CODECS = [StdlibJsonCodec(), PydanticJsonCodec()]
+if orjson is not None:
+    CODECS.append(OrjsonJsonCodec())
+
+
+@pytest.mark.parametrize("codec", CODECS)
+async def test_codec_round_trip(codec):
+    payload = {"text": "é", "bar": [1, 2, 3], "hold": True, "icon": None}
+
+    content = codec.dumps(payload)
+
+    assert content == '{"text":"é","bar":[1,2,3],"hold":true,"icon":null}'.encode()
+    assert codec.loads(content) == payload
+
+
+async def test_orjson_codec():
+    pytest.importorskip("orjson")
+    codec = OrjsonJsonCodec()
+
+    assert (
+        codec.dumps({"text": "é", "bar": [1, 2]}) == '{"text":"é","bar":[1,2]}'.encode()
+    )
+    assert codec.loads(b'[1,"a",null]') == [1, "a", None]
+    assert isinstance(get_default_codec(), OrjsonJsonCodec)
+
+
+async def test_orjson_codec_missing(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+
+    with pytest.raises(RuntimeError, match="orjson is not installed"):
+        OrjsonJsonCodec()
+    assert isinstance(get_default_codec(), PydanticJsonCodec)
+
+
+async def test_default_codec():
+    expected = OrjsonJsonCodec if orjson is not None else PydanticJsonCodec
+    assert isinstance(get_default_codec(), expected)
+
+
+@pytest.mark.parametrize("codec", CODECS)
+async def test_client_codec(
+    codec, httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{base_url}custom?name=test",
+        match_content=b'{"text":"test","bar":[1,2,3]}',
+        match_headers={"Content-Type": "application/json"},
+    )
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}transitions", json=["Random", "Slide"]
+    )
+
+    async with make_awtrix_http_client(codec=codec) as client:
+        await client.set_custom_application(
+            "test", CustomApplication(text="test", bar=[1, 2, 3])
+        )
+        assert await client.get_transitions() == [
+            TransitionType.RANDOM,
+            TransitionType.SLIDE,
+        ]
+
+
+async def test_client_codec_packed_screen(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    matrix = list(range(256))
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}screen", json=matrix, is_reusable=True
+    )
+    loaded = []
+
+    class RecordingCodec(StdlibJsonCodec):
+        def loads(self, data: bytes | str) -> Any:
+            loaded.append(data)
+            return super().loads(data)
+
+    async with make_awtrix_http_client(codec=RecordingCodec()) as client:
+        assert await client.get_packed_screen() == PackedScreen(matrix)
+        assert await anext(client.stream_packed_screen()) == PackedScreen(matrix)
+
+    assert len(loaded) == 2
@@ -0,0 +1,85 @@
+import json
+from array import array
+
+import pytest
+
+from awtrix_light_client.models.screen import (
+    PackedScreen,
+    Screen,
+    ScreenDiff,
+    diff_screens,
+)
+
+MATRIX = [(y << 16) | (x << 8) | (x + y) for y in range(8) for x in range(32)]
+
+
+async def test_packed_screen_round_trip():
+    screen = Screen(matrix=MATRIX)
+    packed = PackedScreen.from_screen(screen)
+
+    assert packed.to_screen() == screen
+    assert PackedScreen.from_json(json.dumps(MATRIX)) == packed
+    assert (
+        PackedScreen.from_json(json.dumps(MATRIX).encode()).row(1).tolist()
+        == (MATRIX[32:64])
+    )
+    with pytest.raises(ValueError, match="screen must have 256 pixels"):
+        PackedScreen.from_json("[1, 2]")
+    assert PackedScreen(packed.tobytes()) == packed
+    assert PackedScreen(array("L" if array("I").itemsize != 4 else "I", MATRIX)) == (
+        packed
+    )
+    assert list(packed) == MATRIX
+    assert len(packed) == 256
+    assert packed[33] == MATRIX[33]
+    assert hash(packed) == hash(PackedScreen(MATRIX))
+    assert packed != MATRIX
+    assert repr(packed).startswith("PackedScreen([")
+
+
+async def test_packed_screen_views():
+    packed = PackedScreen(MATRIX)
+
+    assert packed.pixel(3, 2) == (2 << 16) | (3 << 8) | 5
+    assert packed.row(2).tolist() == MATRIX[64:96]
+    assert packed.column(3).tolist() == MATRIX[3::32]
+    red, green, blue = packed.channels()
+    assert red.tolist() == [y for y in range(8) for _ in range(32)]
+    assert green.tolist() == [x for _ in range(8) for x in range(32)]
+    assert blue.tolist() == [x + y for y in range(8) for x in range(32)]
+    assert packed.pixels.readonly
+
+
+async def test_wrong_packed_screen():
+    with pytest.raises(ValueError, match="screen must have 256 pixels"):
+        PackedScreen([0] * 10)
+
+    packed = PackedScreen(MATRIX)
+    with pytest.raises(IndexError):
+        packed.pixel(32, 0)
+    with pytest.raises(IndexError):
+        packed.row(8)
+    with pytest.raises(IndexError):
+        packed.column(-1)
+
+
+async def test_diff_identical():
+    diff = PackedScreen(MATRIX).diff(PackedScreen(MATRIX))
+
+    assert diff == ScreenDiff()
+    assert not diff
+
+
+async def test_diff():
+    matrix = list(MATRIX)
+    for index in (0, 31, 33, 100, 255):
+        matrix[index] ^= 0x010000
+
+    diff = diff_screens(Screen(matrix=MATRIX), PackedScreen(matrix))
+
+    assert diff
+    assert diff.changed == (0, 31, 33, 100, 255)
+    # rows 0 and 1 are one band, row 3 another, row 7 a third one
+    assert diff.rectangles == ((0, 0, 32, 2), (4, 3, 1, 1), (31, 7, 1, 1))
+    assert diff.ratio == 5 / 256
+    assert diff_screens(PackedScreen(matrix), Screen(matrix=matrix)) == ScreenDiff()
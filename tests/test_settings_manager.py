@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from httpx import Request, Response
+from pydantic_extra_types.color import Color
+from pytest_httpx import HTTPXMock
+
+from awtrix_light_client.emulator import DEFAULT_SETTINGS, AwtrixEmulator
+from awtrix_light_client.http_client import AwtrixLightHttpClientError
+from awtrix_light_client.models.setting import Settings
+from awtrix_light_client.models.transition import TransitionType
+from awtrix_light_client.settings_manager import SettingsManager
+
+
+async def test_update_sends_changed_fields(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}settings", json=DEFAULT_SETTINGS
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{base_url}settings",
+        match_json={"ATIME": 10, "TCOL": 0xFF0000},
+    )
+
+    async with make_awtrix_http_client() as client:
+        manager = SettingsManager(client)
+        assert manager.known is None
+
+        patch = await manager.update(
+            Settings(
+                ATIME=10,
+                TCOL=Color("#FF0000"),
+                TEFF=TransitionType.SLIDE,
+                CCORRECTION=Color("#000000"),
+                TIME_COL=0,
+            )
+        )
+        assert patch == {"ATIME": 10, "TCOL": 0xFF0000}
+        assert manager.known.ATIME == 10
+        assert manager.known.BRI == DEFAULT_SETTINGS["BRI"]
+
+        # already applied, nothing is sent
+        assert await manager.update(Settings(ATIME=10)) == {}
+
+
+async def test_update_failure_invalidates(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}settings", json=DEFAULT_SETTINGS
+    )
+    httpx_mock.add_response(method="POST", url=f"{base_url}settings", status_code=500)
+
+    async with make_awtrix_http_client() as client:
+        manager = SettingsManager(client)
+        with pytest.raises(AwtrixLightHttpClientError):
+            await manager.update(Settings(BRI=10))
+        assert manager.known is None
+
+
+async def test_update_cancelled_invalidates(
+    httpx_mock: HTTPXMock, base_url: str, make_awtrix_http_client
+):
+    async def applied_then_slow(request: Request) -> Response:
+        await asyncio.sleep(1)
+        return Response(200)
+
+    httpx_mock.add_response(
+        method="GET", url=f"{base_url}settings", json=DEFAULT_SETTINGS
+    )
+    httpx_mock.add_callback(applied_then_slow, method="POST", url=f"{base_url}settings")
+
+    async with make_awtrix_http_client() as client:
+        manager = SettingsManager(client)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(manager.update(Settings(BRI=10)), 0.01)
+        # the device may have applied it, going back to the previous value must be sent
+        assert manager.known is None
+
+
+async def test_update_emulator(make_awtrix_http_client):
+    async with AwtrixEmulator() as emulator:
+        async with make_awtrix_http_client(f"{emulator.base_url}api") as client:
+            manager = SettingsManager(client)
+            await manager.refresh()
+
+            assert manager.diff(Settings(BRI=120, SSPEED=50)) == {"SSPEED": 50}
+            assert await manager.update(Settings(BRI=120, SSPEED=50)) == {"SSPEED": 50}
+            assert emulator.settings["SSPEED"] == 50
+            assert emulator.settings["BRI"] == 120
+
+            emulator.settings["SSPEED"] = 100
+            manager.invalidate()
+            assert await manager.update(Settings(SSPEED=50)) == {"SSPEED": 50}
+            assert emulator.requests.count(("POST", "settings")) == 2